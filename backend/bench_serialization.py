@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the list endpoint serialization paths.
+
+Compares, per request, the CPU spent turning N stored insight documents into a
+JSON response body:
+  legacy    - Insight(**doc) per row, then FastAPI response_model re-validation
+              and stdlib json encoding (the pre-fast-path behaviour)
+  validate  - one TypeAdapter validate + dump_json pass (default read path)
+  trust     - orjson over the stored documents (TRUST_STORED_DOCUMENTS=true)
+
+Usage: python bench_serialization.py [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+
+import orjson
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from typing import List
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'bench_database')
+
+import server  # noqa: E402
+from server import Insight  # noqa: E402
+
+
+def make_documents(count: int) -> List[dict]:
+    return [
+        Insight(
+            id=str(uuid.uuid4()),
+            title=f"Market outlook #{i}",
+            excerpt="Our analysis of current market conditions and strategic positioning for the months ahead.",
+            content="Body text. " * 200,
+            category=("Market Insights", "Education", "Strategy")[i % 3],
+            readTime="8 min read",
+        ).model_dump()
+        for i in range(count)
+    ]
+
+
+def run_sync(coro):
+    # serialize_response never suspends for coroutine endpoints, so drive it without an event loop
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("serialize_response suspended unexpectedly")
+
+
+def legacy(docs: List[dict], field) -> bytes:
+    models = [Insight(**d) for d in docs]
+    content = run_sync(serialize_response(field=field, response_content=models))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def validate(docs: List[dict]) -> bytes:
+    server.TRUST_STORED_DOCUMENTS = False
+    return server.encode_documents(Insight, docs)
+
+
+def trust(docs: List[dict]) -> bytes:
+    return orjson.dumps(docs, option=orjson.OPT_UTC_Z)
+
+
+def cpu_per_call(fn, repeat: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    field = create_response_field(name="Response_get_all_insights", type_=List[Insight])
+    print(f"{'items':>6} {'legacy ms':>10} {'validate ms':>12} {'trust ms':>9} {'saved (validate)':>17} {'saved (trust)':>14}")
+    for count in (100, 1000):
+        docs = make_documents(count)
+        repeat = max(1, args.repeat * 100 // count)
+        base = cpu_per_call(lambda: legacy(docs, field), repeat)
+        once = cpu_per_call(lambda: validate(docs), repeat)
+        raw = cpu_per_call(lambda: trust(docs), repeat)
+        print(
+            f"{count:>6} {base * 1000:>10.3f} {once * 1000:>12.3f} {raw * 1000:>9.3f}"
+            f" {(base - once) * 1000:>14.3f} ms {(base - raw) * 1000:>11.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for the Juniper Broz backend.
+
+Uses the same configuration as the API (backend/.env, STORAGE_BACKEND, MONGO_URL, ...):
+
+    python cli.py export-snapshots --out /var/www/juniper/snapshots
+    python cli.py rebuild-contact-rollups
+    python cli.py requeue-notifications
+    python cli.py dedupe-singletons --apply
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from bson import json_util
+
+import server
+from storage import MongoStorage
+
+app = typer.Typer(help="Juniper Broz backend maintenance commands", no_args_is_help=True)
+
+
+@app.callback()
+def main():
+    """Juniper Broz backend maintenance commands"""
+
+
+@app.command("export-snapshots")
+def export_snapshots(
+    out: Optional[Path] = typer.Option(None, help="Output directory (default: SNAPSHOT_DIR)"),
+    only: Optional[List[str]] = typer.Option(None, help="Bundle to export; repeat for several (default: all)"),
+):
+    """Write versioned, precompressed JSON bundles of the public site content"""
+    directory = out or (Path(server.SNAPSHOT_DIR) if server.SNAPSHOT_DIR else None)
+    if directory is None:
+        raise typer.BadParameter("pass --out or set SNAPSHOT_DIR", param_hint="--out")
+
+    async def run():
+        async with server.open_storage():
+            return await server.export_snapshots(directory, only)
+
+    try:
+        manifest = asyncio.run(run())
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--only")
+    for name in only or server.SNAPSHOT_LOADERS:
+        entry = manifest[name]
+        typer.echo(f"{name:<13} {entry['file']:<32} {entry['bytes']:>8} bytes  ({', '.join(entry['encodings'])})")
+
+
+@app.command("rebuild-contact-rollups")
+def rebuild_contact_rollups():
+    """Recompute the daily/weekly contact counters behind /api/contacts/stats from the raw contacts"""
+
+    async def run():
+        async with server.open_storage():
+            return await server.rebuild_contact_rollups()
+
+    typer.echo(f"Rebuilt {asyncio.run(run())} contact counters")
+
+
+@app.command("requeue-notifications")
+def requeue_notifications():
+    """Give dead-lettered lead notifications a fresh set of delivery attempts"""
+
+    async def run():
+        async with server.open_storage():
+            return await server.storage.contact_notifications.requeue_dead(datetime.now(timezone.utc))
+
+    typer.echo(f"Requeued {asyncio.run(run())} lead notifications")
+
+
+@app.command("dedupe-singletons")
+def dedupe_singletons(
+    apply: bool = typer.Option(False, "--apply", help="Delete the duplicates (default: only list them)"),
+    keep: Optional[List[str]] = typer.Option(
+        None, help="_id of the document to keep in its collection; repeat per collection (default: the one served now)"
+    ),
+    backup: Path = typer.Option(Path("singleton_duplicates.json"), help="Where --apply saves the deleted documents"),
+):
+    """Reduce profile/performance to one document each, so their singleton unique index can be built"""
+
+    async def run():
+        async with server.open_storage() as storage:
+            if not isinstance(storage, MongoStorage):
+                raise typer.BadParameter("only the mongo storage backend can hold duplicates")
+            duplicates = await storage.duplicate_singletons()
+            kept = {}
+            for collection_name, docs in duplicates.items():
+                chosen = [doc for doc in docs if str(doc["_id"]) in (keep or ())] or docs[:1]
+                if len(chosen) > 1:
+                    raise typer.BadParameter(f"more than one {collection_name} document given", param_hint="--keep")
+                kept[collection_name] = chosen[0]["_id"]
+                for doc in docs:
+                    marker = "keep" if doc["_id"] == kept[collection_name] else ("delete" if apply else "duplicate")
+                    typer.echo(f"{collection_name:<12} {doc['_id']}  {marker}")
+            if not duplicates:
+                typer.echo("No duplicate singleton documents")
+            elif apply:
+                removed = {
+                    name: [doc for doc in docs if doc["_id"] != kept[name]] for name, docs in duplicates.items()
+                }
+                backup.write_text(json_util.dumps(removed, json_options=json_util.RELAXED_JSON_OPTIONS, indent=2))
+                for collection_name, doc_id in kept.items():
+                    await storage.remove_duplicate_singletons(collection_name, doc_id)
+                await storage.ensure_indexes()
+                typer.echo(f"Deleted {sum(map(len, removed.values()))} documents (saved to {backup})")
+            else:
+                typer.echo("Dry run; pass --apply to delete the duplicates")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    app()
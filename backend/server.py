@@ -1,26 +1,172 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
 import os
 import logging
+import logging.handlers
+from queue import SimpleQueue
+import atexit
+import copy
+import contextvars
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, SkipValidation, TypeAdapter, ValidationError
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Type, Union
 import uuid
-from datetime import datetime, timezone
+import time
+import hashlib
+import base64
+import json
+import asyncio
+import functools
+import gzip
+import orjson
+import math
+import random
+import smtplib
+from email.message import EmailMessage
+import numpy as np
+from datetime import date, datetime, timedelta, timezone
+
+from storage import MemoryStorage, MongoStorage, Storage, bucket_start, rollup_value
+
+try:
+    import brotli
+except ImportError:  # optional: snapshots are then written with gzip only
+    brotli = None
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
-# Create the main app without a prefix
-app = FastAPI()
+# Storage backend: "mongo", or "memory" for hermetic tests and benchmarks (data is not persisted)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'mongo').lower()
+
+# Prometheus metrics at /metrics (request latency per route, Mongo command timings, pool stats)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+# Required with several uvicorn workers, so /metrics aggregates all of them rather than whichever one
+# answers the scrape: an empty directory shared by the workers, wiped before each start. prometheus_client
+# reads it at import, so it must be set in the process environment, not in backend/.env.
+PROMETHEUS_MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR', '')
+
+# Logging: records are handed to a background thread for formatting and output; LOG_FORMAT is json or text
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json').lower()
+# One line per request (route template, status, bytes, duration); replaces uvicorn's access log, which is muted
+ACCESS_LOG_ENABLED = os.environ.get('ACCESS_LOG_ENABLED', 'true').lower() == 'true'
+# Requests slower than this are logged with the Mongo commands they ran (0 = off)
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '500'))
+SLOW_REQUEST_MAX_OPS = 50
+
+# MongoDB connection, opened by the app lifespan so importing this module never connects
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '0'))  # 0 = no timeout
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', '')  # e.g. "zstd,snappy,zlib"
+# Connections to open (by concurrent pings) before serving the first request
+MONGO_WARMUP_CONNECTIONS = int(os.environ.get('MONGO_WARMUP_CONNECTIONS', '4'))
+
+client: Optional[AsyncIOMotorClient] = None
+storage: Optional[Storage] = None
+
+# Response cache settings (seconds a cached read response stays fresh)
+CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', '60'))
+# Seconds past expiry an entry may still be served while one request refreshes it (0 = never serve stale)
+CACHE_STALE_SECONDS = float(os.environ.get('CACHE_STALE_SECONDS', '0'))
+# Entries kept at most; the least recently used is evicted beyond this
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '256'))
+# Cross-worker cache invalidation: "auto" follows a change stream where the server supports one and
+# otherwise polls the shared version counters every CACHE_SYNC_INTERVAL seconds; "poll" always polls
+CACHE_SYNC_MODE = os.environ.get('CACHE_SYNC_MODE', 'auto').lower()
+CACHE_SYNC_INTERVAL = float(os.environ.get('CACHE_SYNC_INTERVAL', '1.0'))
+# Cache-Control for public content reads: browsers revalidate via ETag, shared caches hold briefly
+HTTP_CACHE_CONTROL = os.environ.get('HTTP_CACHE_CONTROL', 'public, max-age=0, s-maxage=60, stale-while-revalidate=30')
+
+# Read path serialization: skip model validation for documents already validated on write
+TRUST_STORED_DOCUMENTS = os.environ.get('TRUST_STORED_DOCUMENTS', 'false').lower() == 'true'
+
+# Static snapshots: precompressed JSON bundles of the public content, rewritten after each write,
+# for nginx or a CDN to serve without touching Python (empty SNAPSHOT_DIR disables them)
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', '')
+SNAPSHOT_DEBOUNCE_SECONDS = float(os.environ.get('SNAPSHOT_DEBOUNCE_SECONDS', '0.5'))
+SNAPSHOT_KEEP_VERSIONS = int(os.environ.get('SNAPSHOT_KEEP_VERSIONS', '3'))
+
+# Pagination settings for admin listings (contacts, status checks)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '500'))
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Write-behind ingestion for contacts and status checks (off by default: each POST does its own insert)
+WRITE_BEHIND_ENABLED = os.environ.get('WRITE_BEHIND_ENABLED', 'false').lower() == 'true'
+WRITE_BEHIND_MAX_QUEUE = int(os.environ.get('WRITE_BEHIND_MAX_QUEUE', '10000'))
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', '500'))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', '0.25'))
+# A failed flush is retried with doubling backoff (producers wait meanwhile) before the batch is dropped
+WRITE_BEHIND_MAX_RETRIES = int(os.environ.get('WRITE_BEHIND_MAX_RETRIES', '6'))
+WRITE_BEHIND_RETRY_BACKOFF = float(os.environ.get('WRITE_BEHIND_RETRY_BACKOFF', '0.5'))
+WRITE_BEHIND_RETRY_BACKOFF_MAX = 10.0
+
+# Status check retention: raw checks expire after this many seconds (TTL index; 0 = keep forever),
+# while per-minute and per-hour counts per client_name are kept for their own windows
+STATUS_CHECK_RETENTION_SECONDS = int(os.environ.get('STATUS_CHECK_RETENTION_SECONDS', '604800'))
+STATUS_ROLLUP_RETENTION_SECONDS = {
+    "minute": int(os.environ.get('STATUS_MINUTE_ROLLUP_RETENTION_SECONDS', '172800')),
+    "hour": int(os.environ.get('STATUS_HOUR_ROLLUP_RETENTION_SECONDS', '7776000')),
+}
+STATUS_SUMMARY_DEFAULT_WINDOW = {"minute": timedelta(hours=1), "hour": timedelta(days=1)}
+
+# Contact analytics: lead counts per investmentGoal per day and per (Monday-based) week
+CONTACT_ROLLUP_GRANULARITIES = ["day", "week"]
+CONTACT_STATS_DEFAULT_WINDOW = {"day": timedelta(days=30), "week": timedelta(weeks=12)}
+# Counters exist only for the contact form's choices; blank goals count as unspecified and
+# anything else (the field is free text) as other
+CONTACT_GOALS = (
+    "portfolio-management", "wealth-planning", "forex-trading",
+    "crypto-investment", "options-strategies", "general-consultation",
+)
+UNSPECIFIED_GOAL = "unspecified"
+OTHER_GOAL = "other"
+
+# Lead notifications: each contact carries an outbox entry that a background worker emails to
+# NOTIFY_TO (off while NOTIFY_SMTP_HOST is unset). Local stand-in: python -m aiosmtpd -n -l localhost:1025
+NOTIFY_SMTP_HOST = os.environ.get('NOTIFY_SMTP_HOST', '')
+NOTIFY_SMTP_PORT = int(os.environ.get('NOTIFY_SMTP_PORT', '25'))
+NOTIFY_SMTP_USER = os.environ.get('NOTIFY_SMTP_USER', '')
+NOTIFY_SMTP_PASSWORD = os.environ.get('NOTIFY_SMTP_PASSWORD', '')
+NOTIFY_SMTP_STARTTLS = os.environ.get('NOTIFY_SMTP_STARTTLS', 'false').lower() == 'true'
+NOTIFY_SMTP_TIMEOUT = float(os.environ.get('NOTIFY_SMTP_TIMEOUT', '10'))
+NOTIFY_FROM = os.environ.get('NOTIFY_FROM', 'notifications@juniperbroz.com')
+NOTIFY_TO = [address.strip() for address in os.environ.get('NOTIFY_TO', 'contact@juniperbroz.com').split(',') if address.strip()]
+NOTIFY_BATCH_SIZE = int(os.environ.get('NOTIFY_BATCH_SIZE', '20'))
+NOTIFY_CONCURRENCY = int(os.environ.get('NOTIFY_CONCURRENCY', '4'))
+NOTIFY_MAX_ATTEMPTS = int(os.environ.get('NOTIFY_MAX_ATTEMPTS', '8'))
+NOTIFY_BACKOFF_BASE_SECONDS = float(os.environ.get('NOTIFY_BACKOFF_BASE_SECONDS', '30'))
+NOTIFY_BACKOFF_MAX_SECONDS = float(os.environ.get('NOTIFY_BACKOFF_MAX_SECONDS', '3600'))
+NOTIFY_POLL_INTERVAL = float(os.environ.get('NOTIFY_POLL_INTERVAL', '5'))
+NOTIFY_LEASE_SECONDS = float(os.environ.get('NOTIFY_LEASE_SECONDS', '300'))
+NOTIFICATIONS_ENABLED = bool(NOTIFY_SMTP_HOST)
+
+# NAV metrics: annual risk-free rate for the Sharpe ratio, trading days per year for annualizing
+RISK_FREE_RATE = float(os.environ.get('RISK_FREE_RATE', '0'))
+TRADING_DAYS_PER_YEAR = 252
+
+# Performance chart generated from the NAV series: lookback per range, default resolution
+CHART_RANGE_DAYS = {"1M": 30, "3M": 91, "6M": 182, "1Y": 365, "3Y": 1096, "5Y": 1826}
+CHART_RANGE_PATTERN = "^(1M|3M|6M|YTD|1Y|3Y|5Y|ALL)$"
+DEFAULT_CHART_POINTS = 250
+MAX_CHART_POINTS = 5000
+# Requested resolutions are rounded up to one of these, bounding the distinct chart variants built and cached
+CHART_POINT_TIERS = (50, 100, 250, 500, 1000, 2500, MAX_CHART_POINTS)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -39,6 +185,22 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
+class StatusCheckPage(BaseModel):
+    items: List[StatusCheck]
+    next_cursor: Optional[str] = None
+
+class StatusRollup(BaseModel):
+    client_name: str
+    start: datetime
+    count: int
+
+class StatusSummary(BaseModel):
+    granularity: str
+    since: datetime
+    until: datetime
+    buckets: List[StatusRollup]
+    totals: Dict[str, int]
+
 
 # Contact Form Models
 class ContactCreate(BaseModel):
@@ -60,6 +222,23 @@ class Contact(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: str = "new"
 
+class ContactPage(BaseModel):
+    items: List[Contact]
+    next_cursor: Optional[str] = None
+
+class ContactStatsBucket(BaseModel):
+    start: datetime
+    count: int
+    goals: Dict[str, int]
+
+class ContactStats(BaseModel):
+    granularity: str
+    since: datetime
+    until: datetime
+    buckets: List[ContactStatsBucket]
+    goals: Dict[str, int]
+    total: int
+
 
 # Profile/Settings Models
 class SocialLinks(BaseModel):
@@ -152,6 +331,18 @@ class Insight(BaseModel):
     readTime: str = "5 min read"
     isPublished: bool = True
 
+# List view of an insight: everything except the article body
+class InsightSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str
+    title: str
+    excerpt: str
+    category: str
+    date: str
+    readTime: str = "5 min read"
+    isPublished: bool = True
+
 class InsightUpdate(BaseModel):
     title: Optional[str] = None
     excerpt: Optional[str] = None
@@ -161,6 +352,44 @@ class InsightUpdate(BaseModel):
     isPublished: Optional[bool] = None
 
 
+class TestimonialPatch(BaseModel):
+    id: str
+    changes: TestimonialUpdate
+
+class InsightPatch(BaseModel):
+    id: str
+    changes: InsightUpdate
+
+
+# Bulk Operation Models
+class BulkDelete(BaseModel):
+    ids: List[str]
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    unchanged: int = 0
+    results: List[BulkItemResult]
+
+
+class CategoryFacet(BaseModel):
+    category: str
+    count: int
+
+class InsightSearchResult(BaseModel):
+    items: List[InsightSummary]
+    total: int
+    categories: List[CategoryFacet]
+    limit: int
+    offset: int
+
+
 # Performance Models
 class PerformanceSummary(BaseModel):
     ytdReturn: str = "+18.4%"
@@ -193,6 +422,1039 @@ class PerformanceUpdate(BaseModel):
     chartData: Optional[List[ChartDataPoint]] = None
     allocation: Optional[List[AllocationItem]] = None
 
+class NavPoint(BaseModel):
+    date: date
+    portfolio: float = Field(gt=0)
+    benchmark: float = Field(gt=0)
+
+class NavIngestResult(BaseModel):
+    ingested: int
+    totalPoints: int
+    incremental: bool
+    summary: PerformanceSummary
+
+
+# Site Bootstrap Model
+class SiteContent(BaseModel):
+    profile: Profile
+    performance: Performance
+    testimonials: List[Testimonial]
+    insights: List[InsightSummary]
+
+
+# ==================== RESPONSE CACHE ====================
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def encode_json(content: BaseModel) -> bytes:
+    """Encode a validated model to compact JSON bytes"""
+    return content.model_dump_json().encode()
+
+
+@functools.lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def encode_document(model: Type[BaseModel], doc: dict) -> bytes:
+    """Encode one stored document, validating it at most once"""
+    if TRUST_STORED_DOCUMENTS:
+        return orjson.dumps(doc, option=orjson.OPT_UTC_Z)
+    return model.model_validate(doc).model_dump_json().encode()
+
+
+def encode_documents(model: Type[BaseModel], docs: List[dict]) -> bytes:
+    """Encode stored documents as a JSON array in a single validate/dump pass"""
+    if TRUST_STORED_DOCUMENTS:
+        return orjson.dumps(docs, option=orjson.OPT_UTC_Z)
+    adapter = list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(docs))
+
+
+def json_response(body: bytes) -> Response:
+    """Return pre-encoded JSON, bypassing response_model re-validation"""
+    return Response(content=body, media_type="application/json")
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the encoded response body"""
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """In-process TTL cache of validated, JSON-encoded read responses.
+
+    Misses are single-flight: concurrent requests for a key that is being loaded await the
+    one load in progress instead of querying storage themselves. With stale_seconds > 0 an
+    expired entry keeps being served for that long while a single background load refreshes it.
+    """
+
+    def __init__(self, ttl: float, stale_seconds: float = 0.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self.stale_served = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+        # Least recently used first, so the bound evicts from the front
+        self._entries: "OrderedDict[str, Tuple[float, CachedBody]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._refreshes = set()
+        # Bumped by every invalidation, so a load that started before one does not store its result
+        self._generation = 0
+
+    def set(self, key: str, body: bytes) -> CachedBody:
+        cached = CachedBody(body, compute_etag(body))
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic() + self.ttl, cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return cached
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[bytes]]) -> CachedBody:
+        """Cached body for key, calling load() at most once at a time per key to fill it"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires = entry[0]
+            now = time.monotonic()
+            self._entries.move_to_end(key)
+            if expires > now:
+                self.hits += 1
+                CACHE_LOOKUPS.labels(cache_family(key), "hit").inc()
+                return entry[1]
+            if now < expires + self.stale_seconds:
+                self.stale_served += 1
+                CACHE_LOOKUPS.labels(cache_family(key), "stale").inc()
+                if key not in self._loading:
+                    refresh = self._start_load(key, load)
+                    self._refreshes.add(refresh)
+                    refresh.add_done_callback(self._refreshes.discard)
+                return entry[1]
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.collapsed += 1
+            CACHE_LOOKUPS.labels(cache_family(key), "collapsed").inc()
+        else:
+            self.misses += 1
+            CACHE_LOOKUPS.labels(cache_family(key), "miss").inc()
+            pending = self._start_load(key, load)
+        # Shield so a waiter being cancelled (client gone) does not cancel the shared load
+        return await asyncio.shield(pending)
+
+    def _start_load(self, key: str, load: Callable[[], Awaitable[bytes]]) -> asyncio.Task:
+        generation = self._generation
+
+        async def run() -> CachedBody:
+            try:
+                body = await load()
+            finally:
+                del self._loading[key]
+            if generation != self._generation:
+                # Invalidated while loading: hand the result to the waiters but do not keep it
+                return CachedBody(body, compute_etag(body))
+            return self.set(key, body)
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(self._load_done)
+        self._loading[key] = task
+        return task
+
+    def _load_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        if task in self._refreshes:
+            self.refresh_errors += 1
+            logger.warning("Background cache refresh failed: %s", task.exception())
+
+    def invalidate(self, key: str) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        self._generation += 1
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collapsed": self.collapsed,
+            "staleServed": self.stale_served,
+            "refreshErrors": self.refresh_errors,
+            "loading": len(self._loading),
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "evictions": self.evictions,
+            "ttlSeconds": self.ttl,
+            "staleSeconds": self.stale_seconds,
+        }
+
+
+def cache_family(key: str) -> str:
+    """Metric label for a cache key: "performance:1Y:250" -> "performance" """
+    return key.split(":", 1)[0]
+
+
+response_cache = ResponseCache(CACHE_TTL_SECONDS, CACHE_STALE_SECONDS, CACHE_MAX_ENTRIES)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+
+def cached_response(request: Request, cached: CachedBody) -> Response:
+    """Serve a cached body, or a bodyless 304 if the client already has it"""
+    headers = {"ETag": cached.etag, "Cache-Control": HTTP_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+# ==================== CACHE COHERENCE ====================
+
+class CacheSync:
+    """Keeps this worker's response cache in step with writes handled by other workers.
+
+    Every write bumps a shared per-collection version; each worker invalidates its cached
+    responses for a collection when it sees that version move, via a change stream or by
+    polling the (few, tiny) version documents. Caches converge within CACHE_SYNC_INTERVAL
+    when polling, and almost immediately with a change stream.
+    """
+
+    def __init__(self, cache: ResponseCache, mode: str, interval: float):
+        self.cache = cache
+        self.mode = mode
+        self.interval = interval
+        self.source = "off"
+        self.remote_invalidations = 0
+        self.errors = 0
+        self._seen: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, name: str) -> None:
+        """Announce a write to a collection and drop this worker's cached responses for it"""
+        version = await storage.versions.bump(name)
+        self.cache.invalidate_prefix(name)
+        # Skip our own bump when polling next, unless another worker's bump came in between
+        if version == self._seen.get(name, 0) + 1:
+            self._seen[name] = version
+
+    def apply(self, name: str, version: int) -> None:
+        if version > self._seen.get(name, 0):
+            self._seen[name] = version
+            self.cache.invalidate_prefix(name)
+            self.remote_invalidations += 1
+
+    async def start(self) -> None:
+        if self.interval <= 0:
+            return
+        self._seen = await storage.versions.get_all()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        if self.mode == "auto":
+            try:
+                self.source = "changestream"
+                async for name, version in storage.versions.watch():
+                    self.apply(name, version)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.info("Cache sync falling back to polling every %.2fs: %s", self.interval, str(e) or "change streams unavailable")
+        self.source = "poll"
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                for name, version in (await storage.versions.get_all()).items():
+                    self.apply(name, version)
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Cache sync poll failed: %s", e)
+
+    def stats(self) -> dict:
+        return {
+            "source": self.source,
+            "intervalSeconds": self.interval,
+            "versions": dict(self._seen),
+            "remoteInvalidations": self.remote_invalidations,
+            "errors": self.errors,
+        }
+
+
+cache_sync = CacheSync(response_cache, CACHE_SYNC_MODE, CACHE_SYNC_INTERVAL)
+
+
+# ==================== FIELD PROJECTIONS ====================
+
+# Insight lists never ship the article body; only get_insight returns it
+INSIGHT_SUMMARY_PROJECTION = {"_id": 0, "content": 0}
+
+
+def field_projection(model: Type[BaseModel], fields: Optional[str], required: Tuple[str, ...] = ("id",)) -> Optional[dict]:
+    """Mongo projection for a comma-separated ?fields= list, checked against the model"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(model.model_fields))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return {"_id": 0, **{name: 1 for name in (*required, *names)}}
+
+
+def encode_projected(content: Union[dict, List[dict]]) -> bytes:
+    """Encode partial documents as stored; they were validated in full on write"""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def projected_response(request: Request, body: bytes) -> Response:
+    """Uncached conditional response for a projected read"""
+    return cached_response(request, CachedBody(body, compute_etag(body)))
+
+
+# ==================== PAGINATION ====================
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque keyset cursor for the (timestamp, id) position of a document"""
+    raw = json.dumps([doc['timestamp'].isoformat(), doc['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, doc_id = json.loads(base64.urlsafe_b64decode(padded))
+        return as_utc(datetime.fromisoformat(timestamp)), doc_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Read naive datetimes (query parameters without an offset) as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def fetch_page(
+    repository, model: Type[BaseModel], since: Optional[datetime], until: Optional[datetime],
+    limit: int, after: Optional[str], projection: Optional[dict] = None,
+) -> Response:
+    """Fetch one keyset page, reading a single extra row to detect whether more follow"""
+    position = decode_cursor(after) if after else None
+    docs = await repository.page(as_utc(since), as_utc(until), position, limit + 1, projection)
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    items = encode_projected(docs[:limit]) if projection else encode_documents(model, docs[:limit])
+    body = b'{"items":%s,"next_cursor":%s}' % (items, orjson.dumps(next_cursor))
+    return json_response(body)
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def stream_ndjson(
+    repository, model: Type[BaseModel], since: Optional[datetime], until: Optional[datetime],
+    after: Optional[str], projection: Optional[dict] = None,
+) -> StreamingResponse:
+    """Stream every matching document after the cursor as NDJSON, holding one batch in memory at a time"""
+    position = decode_cursor(after) if after else None
+
+    async def lines() -> AsyncIterator[bytes]:
+        docs = repository.stream(as_utc(since), as_utc(until), position, projection, EXPORT_BATCH_SIZE)
+        async for doc in docs:
+            yield (encode_projected(doc) if projection else encode_document(model, doc)) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+# ==================== BULK OPERATIONS ====================
+
+def bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    results = sorted(results, key=lambda r: r.index)
+    failed = sum(1 for r in results if r.status in ("error", "not_found"))
+    unchanged = sum(1 for r in results if r.status == "unchanged")
+    return BulkResult(succeeded=len(results) - failed - unchanged, failed=failed, unchanged=unchanged, results=results)
+
+
+def validate_items(model: Type[BaseModel], items: List[Any]) -> Tuple[List[int], List[BaseModel], List[BulkItemResult]]:
+    """Validate bulk items one by one, so an invalid item is reported instead of failing the request.
+    Returns the positions and models of the valid items and an error result per invalid one.
+    Endpoints declare items as SkipValidation[model]: documented in OpenAPI, validated only here."""
+    positions, valid, rejected = [], [], []
+    for i, item in enumerate(items):
+        try:
+            valid.append(model.model_validate(item))
+            positions.append(i)
+        except ValidationError as e:
+            error = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'item'}: {err['msg']}" for err in e.errors())
+            doc_id = item.get("id") if isinstance(item, dict) and isinstance(item.get("id"), str) else None
+            rejected.append(BulkItemResult(index=i, id=doc_id, status="error", error=error))
+    return positions, valid, rejected
+
+
+async def bulk_insert(
+    repository, items: List[BaseModel], positions: Optional[List[int]] = None, rejected: List[BulkItemResult] = (),
+) -> BulkResult:
+    """Insert validated models in one unordered batch, reporting each item's outcome at its
+    request position (positions[i], default i) alongside the rejected items"""
+    errors = await repository.insert_many([item.model_dump() for item in items])
+    positions = positions or list(range(len(items)))
+    return bulk_result([*rejected, *(
+        BulkItemResult(index=positions[i], id=item.id, status="error", error=errors[i]) if i in errors
+        else BulkItemResult(index=positions[i], id=item.id, status="created")
+        for i, item in enumerate(items)
+    )])
+
+
+async def bulk_update(
+    repository, patches: List[Union[TestimonialPatch, InsightPatch]],
+    positions: Optional[List[int]] = None, rejected: List[BulkItemResult] = (),
+) -> BulkResult:
+    """Apply per-document $set changes in one unordered batch; patches without changes are unchanged"""
+    positions = positions or list(range(len(patches)))
+    found = await repository.existing_ids([patch.id for patch in patches])
+    updates, updated = [], []
+    for i, patch in enumerate(patches):
+        update_data = {k: v for k, v in patch.changes.model_dump().items() if v is not None}
+        if patch.id in found and update_data:
+            updates.append((patch.id, update_data))
+            updated.append(i)
+    errors = {updated[i]: error for i, error in (await repository.update_many(updates)).items()}
+    results = list(rejected)
+    for i, patch in enumerate(patches):
+        if patch.id not in found:
+            results.append(BulkItemResult(index=positions[i], id=patch.id, status="not_found"))
+        elif i in errors:
+            results.append(BulkItemResult(index=positions[i], id=patch.id, status="error", error=errors[i]))
+        elif i in updated:
+            results.append(BulkItemResult(index=positions[i], id=patch.id, status="updated"))
+        else:
+            results.append(BulkItemResult(index=positions[i], id=patch.id, status="unchanged"))
+    return bulk_result(results)
+
+
+async def bulk_delete(repository, ids: List[str]) -> BulkResult:
+    """Delete documents by id in one batch"""
+    found = await repository.existing_ids(ids)
+    if found:
+        await repository.delete_many(list(found))
+    return bulk_result([
+        BulkItemResult(index=i, id=doc_id, status="deleted" if doc_id in found else "not_found")
+        for i, doc_id in enumerate(ids)
+    ])
+
+
+# ==================== WRITE-BEHIND INGESTION ====================
+
+class WriteBehindQueue:
+    """Bounded queue of validated documents flushed to one event repository in batches.
+
+    A batch is flushed when it reaches batch_size documents or flush_interval seconds
+    after its first document, whichever comes first. A flush that raises is retried with
+    backoff up to max_retries times before its documents are counted as dropped. Producers
+    wait when the queue is full (as it fills during retries), and stop() drains everything
+    still queued.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self, collection_name: str, max_size: int, batch_size: int, flush_interval: float,
+        max_retries: int = WRITE_BEHIND_MAX_RETRIES, retry_backoff: float = WRITE_BEHIND_RETRY_BACKOFF,
+    ):
+        self.collection_name = collection_name
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.flushes = 0
+        self.flushed_documents = 0
+        self.errors = 0
+        self.retries = 0
+        self.dropped_documents = 0
+        self.total_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await self._queue.put(self._STOP)
+        await self._task
+        self._task = None
+
+    async def put(self, doc: dict) -> None:
+        await self._queue.put(doc)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is self._STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                if not self._queue.empty():
+                    doc = self._queue.get_nowait()
+                else:
+                    try:
+                        doc = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if doc is self._STOP:
+                    stopping = True
+                    break
+                batch.append(doc)
+            await self._flush(batch)
+
+    async def _insert(self, batch: List[dict]) -> Optional[Dict[int, str]]:
+        """Insert the batch, retrying failures with backoff; None once retries are exhausted"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                errors = await getattr(storage, self.collection_name).insert_many(batch)
+            except Exception as e:
+                self.errors += 1
+                if attempt == self.max_retries:
+                    logger.error(
+                        "Write-behind flush of %d %s failed after %d retries, dropping the batch: %s",
+                        len(batch), self.collection_name, self.max_retries, e,
+                    )
+                    return None
+                delay = min(WRITE_BEHIND_RETRY_BACKOFF_MAX, self.retry_backoff * 2 ** attempt)
+                logger.warning(
+                    "Write-behind flush of %d %s failed, retrying in %.1fs: %s", len(batch), self.collection_name, delay, e,
+                )
+                self.retries += 1
+                await asyncio.sleep(delay)
+                continue
+            if attempt:
+                # A failed attempt may have stored part of the batch; those now collide on id
+                errors = {i: error for i, error in errors.items() if "duplicate key" not in error}
+            return errors
+
+    async def _flush(self, batch: List[dict]) -> None:
+        started = time.perf_counter()
+        errors = await self._insert(batch)
+        if errors is None:
+            self.dropped_documents += len(batch)
+        else:
+            self.flushed_documents += len(batch) - len(errors)
+            self.dropped_documents += len(errors)
+            await ingested(self.collection_name, [doc for i, doc in enumerate(batch) if i not in errors])
+        elapsed = time.perf_counter() - started
+        self.flushes += 1
+        self.total_flush_seconds += elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "maxSize": self.max_size,
+            "flushes": self.flushes,
+            "flushedDocuments": self.flushed_documents,
+            "errors": self.errors,
+            "retries": self.retries,
+            "droppedDocuments": self.dropped_documents,
+            "avgFlushMs": round(self.total_flush_seconds / self.flushes * 1000, 3) if self.flushes else 0.0,
+            "maxFlushMs": round(self.max_flush_seconds * 1000, 3),
+        }
+
+
+write_behind_queues = {
+    name: WriteBehindQueue(name, WRITE_BEHIND_MAX_QUEUE, WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_FLUSH_INTERVAL)
+    for name in ("contacts", "status_checks")
+}
+
+
+async def insert_ingested(collection_name: str, doc: dict) -> None:
+    """Insert directly, or hand off to the write-behind queue when it is enabled"""
+    if WRITE_BEHIND_ENABLED:
+        await write_behind_queues[collection_name].put(doc)
+    else:
+        await getattr(storage, collection_name).insert(doc)
+        await ingested(collection_name, [doc])
+
+
+async def ingested(collection_name: str, docs: List[dict]) -> None:
+    """Update the counters derived from newly stored documents; a failure is logged, not raised,
+    since the documents themselves are already stored"""
+    hook = INGEST_HOOKS.get(collection_name)
+    if hook is None or not docs:
+        return
+    try:
+        await hook(docs)
+    except Exception as e:
+        logger.error("Updating rollups for %d %s failed: %s", len(docs), collection_name, e)
+
+
+# ==================== ROLLUPS ====================
+
+async def record_status_rollups(docs: List[dict]) -> None:
+    """Count status checks per client_name into their minute and hour buckets"""
+    counts: Dict[Tuple[str, datetime, str], int] = {}
+    for doc in docs:
+        for granularity in STATUS_ROLLUP_RETENTION_SECONDS:
+            key = (granularity, bucket_start(doc["timestamp"], granularity), doc["client_name"])
+            counts[key] = counts.get(key, 0) + 1
+    updates = []
+    for (granularity, start, client_name), count in counts.items():
+        retention = STATUS_ROLLUP_RETENTION_SECONDS[granularity]
+        expires_at = start + timedelta(seconds=retention) if retention else None
+        updates.append(({"granularity": granularity, "bucket": start, "client_name": client_name}, count, expires_at))
+    await storage.status_rollups.increment(updates)
+
+
+def contact_goal(goal: Optional[str]) -> str:
+    """The contact rollup counter an investmentGoal is counted under"""
+    return rollup_value(goal, CONTACT_GOALS, UNSPECIFIED_GOAL, OTHER_GOAL)
+
+
+async def record_contact_rollups(docs: List[dict]) -> None:
+    """Count contacts per investmentGoal into their day and week buckets"""
+    counts: Dict[Tuple[str, datetime, str], int] = {}
+    for doc in docs:
+        goal = contact_goal(doc.get("investmentGoal"))
+        for granularity in CONTACT_ROLLUP_GRANULARITIES:
+            key = (granularity, bucket_start(doc["timestamp"], granularity), goal)
+            counts[key] = counts.get(key, 0) + 1
+    await storage.contact_rollups.increment([
+        ({"granularity": granularity, "bucket": start, "investmentGoal": goal}, count, None)
+        for (granularity, start, goal), count in counts.items()
+    ])
+
+
+async def rebuild_contact_rollups() -> int:
+    """Recompute the contact counters from the stored contacts; returns the number of counters"""
+    return await storage.contact_rollups.rebuild(
+        storage.contacts, "investmentGoal", CONTACT_ROLLUP_GRANULARITIES, CONTACT_GOALS, UNSPECIFIED_GOAL, OTHER_GOAL
+    )
+
+
+INGEST_HOOKS: Dict[str, Callable[[List[dict]], Awaitable[None]]] = {
+    "contacts": record_contact_rollups,
+    "status_checks": record_status_rollups,
+}
+
+
+# ==================== LEAD NOTIFICATIONS ====================
+
+def header_text(value: str) -> str:
+    """Submitted text made safe for a mail header (line breaks would inject headers or be rejected)"""
+    return " ".join(value.split())
+
+
+def lead_email(doc: dict) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = f"New consultation request from {header_text(doc['name'])}"
+    message["From"] = NOTIFY_FROM
+    message["To"] = ", ".join(NOTIFY_TO)
+    message["Reply-To"] = header_text(doc["email"])
+    message.set_content("\n".join([
+        f"Name: {doc['name']}",
+        f"Email: {doc['email']}",
+        f"Phone: {doc.get('phone') or '-'}",
+        f"Investment goal: {doc.get('investmentGoal') or '-'}",
+        f"Received: {as_utc(doc['timestamp']).isoformat()}",
+        "",
+        doc.get("message") or "",
+    ]))
+    return message
+
+
+def send_lead_emails(docs: List[dict]) -> Dict[str, Optional[str]]:
+    """Email one notification per contact over a single SMTP session (blocking; run in a thread).
+    Returns the error for each contact id, None where the message was accepted. A failure only
+    affects the contacts not yet sent: one bad message never fails the ones already accepted."""
+    results: Dict[str, Optional[str]] = {}
+    try:
+        smtp = smtplib.SMTP(NOTIFY_SMTP_HOST, NOTIFY_SMTP_PORT, timeout=NOTIFY_SMTP_TIMEOUT)
+        try:
+            if NOTIFY_SMTP_STARTTLS:
+                smtp.starttls()
+            if NOTIFY_SMTP_USER:
+                smtp.login(NOTIFY_SMTP_USER, NOTIFY_SMTP_PASSWORD)
+            for doc in docs:
+                try:
+                    smtp.send_message(lead_email(doc))
+                    results[doc["id"]] = None
+                except Exception as e:
+                    results[doc["id"]] = f"{type(e).__name__}: {e}"
+        finally:
+            try:
+                smtp.quit()
+            except Exception:
+                smtp.close()
+    except Exception as e:
+        # Connecting or authenticating failed: nothing left in the batch was sent
+        for doc in docs:
+            results.setdefault(doc["id"], f"{type(e).__name__}: {e}")
+    return results
+
+
+def notification_backoff(attempts: int) -> float:
+    """Seconds before the next attempt: exponential in attempts so far, capped, with jitter"""
+    delay = min(NOTIFY_BACKOFF_MAX_SECONDS, NOTIFY_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class NotificationWorker:
+    """Delivers the contact outbox in the background, off the request path.
+
+    Each round claims up to batch_size due contacts and sends them over one SMTP session, with
+    at most concurrency rounds in flight. A failed send is retried with exponential backoff and
+    dead-lettered after max_attempts. The worker polls every poll_interval seconds and is woken
+    early by contacts created in this process; claims are leased, so several workers can share
+    the outbox.
+    """
+
+    def __init__(self, enabled: bool, batch_size: int, concurrency: int, max_attempts: int, poll_interval: float):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.errors = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._deliveries: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self._wake = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Let sends already under way record their outcome; unclaimed work stays in the outbox
+        await asyncio.gather(*self._deliveries)
+
+    def wake(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            self._wake.clear()
+            now = datetime.now(timezone.utc)
+            try:
+                docs = await storage.contact_notifications.claim(
+                    now, now + timedelta(seconds=NOTIFY_LEASE_SECONDS), self.batch_size
+                )
+            except Exception as e:
+                self.errors += 1
+                logger.error("Claiming lead notifications failed: %s", e)
+                docs = []
+            if not docs:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            delivery = asyncio.create_task(self._deliver(docs))
+            self._deliveries.add(delivery)
+            delivery.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, docs: List[dict]) -> None:
+        try:
+            try:
+                results = await asyncio.to_thread(send_lead_emails, docs)
+            except Exception as e:
+                results = {doc["id"]: f"{type(e).__name__}: {e}" for doc in docs}
+            now = datetime.now(timezone.utc)
+            for doc in docs:
+                error = results.get(doc["id"])
+                attempts = doc["notification"]["attempts"]
+                if error is None:
+                    await storage.contact_notifications.complete(doc["id"], now)
+                    self.sent += 1
+                elif attempts >= self.max_attempts:
+                    await storage.contact_notifications.dead_letter(doc["id"], now, error)
+                    self.dead_lettered += 1
+                    logger.warning("Lead notification for contact %s dead-lettered after %d attempts: %s", doc["id"], attempts, error)
+                else:
+                    next_attempt_at = now + timedelta(seconds=notification_backoff(attempts))
+                    await storage.contact_notifications.retry(doc["id"], next_attempt_at, error)
+                    self.retried += 1
+        except Exception as e:
+            # Outcomes not recorded are retried once their claim's lease runs out
+            self.errors += 1
+            logger.error("Recording lead notification results failed: %s", e)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "inFlight": len(self._deliveries),
+            "sent": self.sent,
+            "retried": self.retried,
+            "deadLettered": self.dead_lettered,
+            "errors": self.errors,
+        }
+
+
+notification_worker = NotificationWorker(
+    NOTIFICATIONS_ENABLED, NOTIFY_BATCH_SIZE, NOTIFY_CONCURRENCY, NOTIFY_MAX_ATTEMPTS, NOTIFY_POLL_INTERVAL
+)
+
+
+# ==================== NAV TIME SERIES ====================
+
+# Daily NAV points live in one document per calendar year, each column packed as a
+# little-endian array (days since 1970 as int32, NAVs as float64). Running metric state
+# is stored alongside so appends only fold in the new points.
+
+def pack_array(values: np.ndarray, dtype: str) -> bytes:
+    return np.ascontiguousarray(values, dtype=dtype).tobytes()
+
+
+def unpack_array(data: bytes, dtype: str) -> np.ndarray:
+    return np.frombuffer(data, dtype=dtype)
+
+
+def nav_years(days: np.ndarray) -> np.ndarray:
+    return days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+def last_per_day(days: np.ndarray, *columns: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Sort by day, keeping the last value given for any repeated day"""
+    _, first_from_end = np.unique(days[::-1], return_index=True)
+    keep = len(days) - 1 - first_from_end
+    return (days[keep],) + tuple(column[keep] for column in columns)
+
+
+def accumulate_nav_stats(state: Optional[dict], days: np.ndarray, nav: np.ndarray) -> dict:
+    """Fold NAV points dated after state's last point into the running metrics.
+
+    With state None the metrics are computed from scratch. Return mean and variance are
+    merged with Chan's parallel update, so an append costs O(new points).
+    """
+    years = nav_years(days)
+    if state is None:
+        series, series_years = nav, years
+        state = {
+            "firstDay": int(days[0]), "firstNav": float(nav[0]),
+            "count": 0, "mean": 0.0, "m2": 0.0,
+            "peak": float(nav[0]), "maxDrawdown": 0.0,
+            "year": int(years[0]), "yearStartNav": float(nav[0]),
+        }
+    else:
+        series = np.concatenate(([state["lastNav"]], nav))
+        series_years = np.concatenate(([state["year"]], years))
+        state = dict(state)
+
+    returns = series[1:] / series[:-1] - 1.0
+    if returns.size:
+        n_a, n_b = state["count"], returns.size
+        mean_b = float(returns.mean())
+        m2_b = float(np.square(returns - mean_b).sum())
+        n = n_a + n_b
+        delta = mean_b - state["mean"]
+        state["mean"] += delta * n_b / n
+        state["m2"] += m2_b + delta * delta * n_a * n_b / n
+        state["count"] = n
+
+    peaks = np.maximum.accumulate(np.concatenate(([state["peak"]], nav)))[1:]
+    state["maxDrawdown"] = min(state["maxDrawdown"], float((nav / peaks - 1.0).min()))
+    state["peak"] = float(peaks[-1])
+
+    # YTD is measured from the last NAV of the previous year (or the year's first NAV)
+    last_year = int(years[-1])
+    if last_year != state["year"]:
+        earlier = series[series_years < last_year]
+        state["yearStartNav"] = float(earlier[-1]) if earlier.size else float(nav[years == last_year][0])
+        state["year"] = last_year
+
+    state["lastDay"] = int(days[-1])
+    state["lastNav"] = float(nav[-1])
+    return state
+
+
+def nav_summary(state: dict) -> PerformanceSummary:
+    ytd = state["lastNav"] / state["yearStartNav"] - 1.0
+    span_days = state["lastDay"] - state["firstDay"]
+    annual = (state["lastNav"] / state["firstNav"]) ** (365.25 / span_days) - 1.0 if span_days > 0 else 0.0
+    std = math.sqrt(state["m2"] / (state["count"] - 1)) if state["count"] > 1 else 0.0
+    excess = state["mean"] - RISK_FREE_RATE / TRADING_DAYS_PER_YEAR
+    sharpe = excess / std * math.sqrt(TRADING_DAYS_PER_YEAR) if std > 0 else 0.0
+    return PerformanceSummary(
+        ytdReturn=f"{ytd * 100:+.1f}%",
+        avgAnnualReturn=f"{annual * 100:+.1f}%",
+        sharpeRatio=f"{sharpe:.2f}",
+        maxDrawdown=f"{state['maxDrawdown'] * 100:.1f}%",
+    )
+
+
+async def load_nav_series(from_year: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate stored yearly buckets into (days, portfolio, benchmark) arrays"""
+    buckets = await storage.nav.get_buckets(from_year=from_year)
+    if not buckets:
+        return np.empty(0, "<i4"), np.empty(0, "<f8"), np.empty(0, "<f8")
+    return tuple(
+        np.concatenate([unpack_array(b[column], dtype) for b in buckets])
+        for column, dtype in (("days", "<i4"), ("portfolio", "<f8"), ("benchmark", "<f8"))
+    )
+
+
+async def ingest_nav_points(points: List[NavPoint]) -> NavIngestResult:
+    """Merge NAV points into their yearly buckets and bring the summary metrics up to date"""
+    days = np.array([p.date.toordinal() for p in points], dtype=np.int64) - date(1970, 1, 1).toordinal()
+    portfolio = np.array([p.portfolio for p in points], dtype=np.float64)
+    benchmark = np.array([p.benchmark for p in points], dtype=np.float64)
+    days, portfolio, benchmark = last_per_day(days, portfolio, benchmark)
+    years = nav_years(days)
+
+    touched = [int(y) for y in np.unique(years)]
+    existing = {b["_id"]: b for b in await storage.nav.get_buckets(years=touched)}
+    buckets = []
+    for year in touched:
+        in_year = years == year
+        merged = (days[in_year], portfolio[in_year], benchmark[in_year])
+        if year in existing:
+            bucket = existing[year]
+            merged = last_per_day(*(
+                np.concatenate((unpack_array(bucket[column], dtype), new))
+                for (column, dtype), new in zip((("days", "<i4"), ("portfolio", "<f8"), ("benchmark", "<f8")), merged)
+            ))
+        buckets.append({
+            "_id": year,
+            "count": int(merged[0].size),
+            "days": pack_array(merged[0], "<i4"),
+            "portfolio": pack_array(merged[1], "<f8"),
+            "benchmark": pack_array(merged[2], "<f8"),
+        })
+    await storage.nav.save_buckets(buckets)
+
+    state = await storage.nav.get_stats()
+    incremental = state is not None and int(days[0]) > state["lastDay"]
+    if incremental:
+        state = accumulate_nav_stats(state, days, portfolio)
+    else:
+        # Backfill or correction: recompute over the full history
+        all_days, all_portfolio, _ = await load_nav_series()
+        state = accumulate_nav_stats(None, all_days, all_portfolio)
+    await storage.nav.save_stats(state)
+
+    summary = nav_summary(state)
+    await storage.performance.set_fields({"summary": summary.model_dump()}, default_performance().model_dump())
+    await content_changed("performance")
+    # Every stored point after the first contributes exactly one return
+    return NavIngestResult(ingested=int(days.size), totalPoints=state["count"] + 1, incremental=incremental, summary=summary)
+
+
+def lttb_indices(x: np.ndarray, ys: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling of series sharing an x axis.
+
+    ys has shape (series, n). Each series is scaled to [0, 1] and the triangle areas are
+    summed across series, so one set of indices preserves the shape of all of them.
+    """
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    low = ys.min(axis=1, keepdims=True)
+    span = ys.max(axis=1, keepdims=True) - low
+    ys = (ys - low) / np.where(span > 0, span, 1.0)
+    xs = (x - x[0]) / max(float(x[-1] - x[0]), 1.0)
+
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < threshold - 1 else (n - 1, n)
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[:, next_start:next_end].mean(axis=1, keepdims=True)
+        ay = ys[:, a:a + 1]
+        area = np.abs((xs[a] - avg_x) * (ys[:, start:end] - ay) - (xs[a] - xs[start:end]) * (avg_y - ay)).sum(axis=0)
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+async def build_chart_data(chart_range: str, points: int) -> Optional[List[dict]]:
+    """Chart points for a range, rebased to 100 at its start; None when no NAV series is stored"""
+    stats = await storage.nav.get_stats()
+    if stats is None:
+        return None
+    if chart_range == "YTD":
+        start_day = int(np.datetime64(f"{stats['year']}-01-01", "D").astype(np.int64))
+    elif chart_range in CHART_RANGE_DAYS:
+        start_day = stats["lastDay"] - CHART_RANGE_DAYS[chart_range]
+    else:
+        start_day = None
+    from_year = None
+    if start_day is not None:
+        from_year = int(nav_years(np.array([start_day]))[0])
+    days, portfolio, benchmark = await load_nav_series(from_year)
+    if start_day is not None:
+        in_range = days >= start_day
+        days, portfolio, benchmark = days[in_range], portfolio[in_range], benchmark[in_range]
+    if days.size == 0:
+        return []
+    # A long series takes LTTB ~100 ms; keep it off the event loop
+    keep = await asyncio.to_thread(lttb_indices, days.astype(np.float64), np.vstack((portfolio, benchmark)), points)
+    labels = days[keep].astype("datetime64[D]").astype(str).tolist()
+    rebased_portfolio = np.round(portfolio[keep] / portfolio[0] * 100, 2).tolist()
+    rebased_benchmark = np.round(benchmark[keep] / benchmark[0] * 100, 2).tolist()
+    return [
+        {"month": label, "portfolio": p, "benchmark": b}
+        for label, p, b in zip(labels, rebased_portfolio, rebased_benchmark)
+    ]
+
+
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
@@ -202,25 +1464,42 @@ async def root():
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
-    
-    # Convert to dict and serialize datetime to ISO string for MongoDB
     doc = status_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
-    
-    _ = await db.status_checks.insert_one(doc)
+    await insert_ingested("status_checks", doc)
     return status_obj
 
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    # Exclude MongoDB's _id field from the query results
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
-    
-    # Convert ISO string timestamps back to datetime objects
-    for check in status_checks:
-        if isinstance(check['timestamp'], str):
-            check['timestamp'] = datetime.fromisoformat(check['timestamp'])
-    
-    return status_checks
+@api_router.get("/status", response_model=StatusCheckPage)
+async def get_status_checks(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = None,
+):
+    """Get status checks, newest first, one keyset page at a time (or streamed as NDJSON)"""
+    projection = field_projection(StatusCheck, fields, required=("id", "timestamp"))
+    if wants_ndjson(request):
+        return stream_ndjson(storage.status_checks, StatusCheck, since, until, after, projection)
+    return await fetch_page(storage.status_checks, StatusCheck, since, until, limit, after, projection)
+
+@api_router.get("/status/summary", response_model=StatusSummary)
+async def get_status_summary(
+    granularity: str = Query("minute", pattern="^(minute|hour)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    client_name: Optional[str] = None,
+):
+    """Status check counts per client_name per minute or hour, served from the rollups"""
+    until = as_utc(until) or datetime.now(timezone.utc)
+    since = as_utc(since) or bucket_start(until - STATUS_SUMMARY_DEFAULT_WINDOW[granularity], granularity)
+    match = {"client_name": client_name} if client_name is not None else None
+    rows = await storage.status_rollups.find(granularity, since, until, match)
+    buckets = [StatusRollup(client_name=row["client_name"], start=row["bucket"], count=row["count"]) for row in rows]
+    totals: Dict[str, int] = {}
+    for bucket in buckets:
+        totals[bucket.client_name] = totals.get(bucket.client_name, 0) + bucket.count
+    return StatusSummary(granularity=granularity, since=since, until=until, buckets=buckets, totals=totals)
 
 
 # ==================== CONTACT ENDPOINTS ====================
@@ -230,116 +1509,277 @@ async def create_contact(input: ContactCreate):
     """Submit a contact/consultation request"""
     contact_obj = Contact(**input.model_dump())
     doc = contact_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
-    await db.contacts.insert_one(doc)
+    if NOTIFICATIONS_ENABLED:
+        # Outbox entry stored with the contact itself, so queuing the notification costs no extra write
+        doc["notification"] = {"state": "pending", "attempts": 0, "nextAttemptAt": contact_obj.timestamp}
+    await insert_ingested("contacts", doc)
+    notification_worker.wake()
     return contact_obj
 
-@api_router.get("/contacts", response_model=List[Contact])
-async def get_contacts():
-    """Get all contact submissions"""
-    contacts = await db.contacts.find({}, {"_id": 0}).to_list(1000)
-    for contact in contacts:
-        if isinstance(contact.get('timestamp'), str):
-            contact['timestamp'] = datetime.fromisoformat(contact['timestamp'])
-    return contacts
+@api_router.get("/contacts", response_model=ContactPage)
+async def get_contacts(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    fields: Optional[str] = None,
+):
+    """Get contact submissions, newest first, one keyset page at a time (or streamed as NDJSON)"""
+    projection = field_projection(Contact, fields, required=("id", "timestamp"))
+    if wants_ndjson(request):
+        return stream_ndjson(storage.contacts, Contact, since, until, after, projection)
+    return await fetch_page(storage.contacts, Contact, since, until, limit, after, projection)
+
+@api_router.get("/contacts/stats", response_model=ContactStats)
+async def get_contact_stats(
+    granularity: str = Query("day", pattern="^(day|week)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    investmentGoal: Optional[str] = None,
+):
+    """Lead counts per day or week with their investmentGoal breakdown, served from the rollups"""
+    until = as_utc(until) or datetime.now(timezone.utc)
+    since = as_utc(since) or bucket_start(until - CONTACT_STATS_DEFAULT_WINDOW[granularity], granularity)
+    match = {"investmentGoal": investmentGoal} if investmentGoal is not None else None
+    buckets: Dict[datetime, ContactStatsBucket] = {}
+    goals: Dict[str, int] = {}
+    for row in await storage.contact_rollups.find(granularity, since, until, match):
+        bucket = buckets.setdefault(row["bucket"], ContactStatsBucket(start=row["bucket"], count=0, goals={}))
+        bucket.count += row["count"]
+        bucket.goals[row["investmentGoal"]] = row["count"]
+        goals[row["investmentGoal"]] = goals.get(row["investmentGoal"], 0) + row["count"]
+    return ContactStats(
+        granularity=granularity, since=since, until=until, buckets=list(buckets.values()),
+        goals=goals, total=sum(goals.values()),
+    )
 
 
 # ==================== PROFILE ENDPOINTS ====================
 
+async def read_profile() -> bytes:
+    profile = await storage.profile.get()
+    if not profile:
+        # Create the default profile on first use; concurrent first requests all get the same one
+        profile = await storage.profile.get_or_create(Profile().model_dump())
+    return encode_document(Profile, profile)
+
+async def load_profile() -> CachedBody:
+    return await response_cache.get_or_load("profile", read_profile)
+
 @api_router.get("/profile", response_model=Profile)
-async def get_profile():
+async def get_profile(request: Request, fields: Optional[str] = None):
     """Get site profile/settings"""
-    profile = await db.profile.find_one({}, {"_id": 0})
-    if not profile:
-        # Return default profile if none exists
-        default_profile = Profile()
-        doc = default_profile.model_dump()
-        await db.profile.insert_one(doc)
-        return default_profile
-    return Profile(**profile)
+    projection = field_projection(Profile, fields)
+    if projection:
+        profile = await storage.profile.get(projection)
+        if profile is None:
+            profile = await storage.profile.get_or_create(Profile().model_dump(), projection)
+        return projected_response(request, encode_projected(profile))
+    return cached_response(request, await load_profile())
 
 @api_router.put("/profile", response_model=Profile)
 async def update_profile(input: ProfileUpdate):
     """Update site profile/settings"""
     update_data = {k: v for k, v in input.model_dump().items() if v is not None}
-    if update_data:
-        if 'socialLinks' in update_data and update_data['socialLinks']:
-            update_data['socialLinks'] = update_data['socialLinks']
-        await db.profile.update_one({}, {"$set": update_data}, upsert=True)
-    profile = await db.profile.find_one({}, {"_id": 0})
-    return Profile(**profile)
+    if not update_data:
+        # Nothing changes (a missing document is created as the default reads already serve)
+        return Profile(**await storage.profile.get_or_create(Profile().model_dump()))
+    profile = await storage.profile.set_fields(update_data, Profile().model_dump())
+    profile_obj = Profile(**profile)
+    await content_changed("profile")
+    response_cache.set("profile", encode_json(profile_obj))
+    return profile_obj
 
 
 # ==================== TESTIMONIAL ENDPOINTS ====================
 
+async def read_testimonials() -> bytes:
+    return encode_documents(Testimonial, await storage.testimonials.list({"isActive": True}))
+
+async def load_testimonials() -> CachedBody:
+    return await response_cache.get_or_load("testimonials", read_testimonials)
+
 @api_router.get("/testimonials", response_model=List[Testimonial])
-async def get_testimonials():
+async def get_testimonials(request: Request, fields: Optional[str] = None):
     """Get all active testimonials"""
-    testimonials = await db.testimonials.find({"isActive": True}, {"_id": 0}).to_list(100)
-    return [Testimonial(**t) for t in testimonials]
+    projection = field_projection(Testimonial, fields)
+    if projection:
+        testimonials = await storage.testimonials.list({"isActive": True}, projection)
+        return projected_response(request, encode_projected(testimonials))
+    return cached_response(request, await load_testimonials())
 
 @api_router.get("/testimonials/all", response_model=List[Testimonial])
-async def get_all_testimonials():
+async def get_all_testimonials(fields: Optional[str] = None):
     """Get all testimonials (including inactive)"""
-    testimonials = await db.testimonials.find({}, {"_id": 0}).to_list(100)
-    return [Testimonial(**t) for t in testimonials]
+    projection = field_projection(Testimonial, fields)
+    testimonials = await storage.testimonials.list({}, projection)
+    if projection:
+        return json_response(encode_projected(testimonials))
+    return json_response(encode_documents(Testimonial, testimonials))
 
 @api_router.post("/testimonials", response_model=Testimonial)
 async def create_testimonial(input: TestimonialCreate):
     """Create a new testimonial"""
     testimonial_obj = Testimonial(**input.model_dump())
-    await db.testimonials.insert_one(testimonial_obj.model_dump())
+    await storage.testimonials.insert(testimonial_obj.model_dump())
+    await content_changed("testimonials")
     return testimonial_obj
 
+@api_router.post("/testimonials/bulk", response_model=BulkResult)
+async def create_testimonials_bulk(input: List[SkipValidation[TestimonialCreate]]):
+    """Create many testimonials in one write; each item is a TestimonialCreate, validated on its own"""
+    positions, items, rejected = validate_items(TestimonialCreate, input)
+    result = await bulk_insert(storage.testimonials, [Testimonial(**t.model_dump()) for t in items], positions, rejected)
+    if result.succeeded:
+        await content_changed("testimonials")
+    return result
+
+@api_router.patch("/testimonials/bulk", response_model=BulkResult)
+async def update_testimonials_bulk(input: List[SkipValidation[TestimonialPatch]]):
+    """Update many testimonials (e.g. toggle isActive) in one write; each item is a TestimonialPatch"""
+    positions, patches, rejected = validate_items(TestimonialPatch, input)
+    result = await bulk_update(storage.testimonials, patches, positions, rejected)
+    if result.succeeded:
+        await content_changed("testimonials")
+    return result
+
+@api_router.delete("/testimonials/bulk", response_model=BulkResult)
+async def delete_testimonials_bulk(input: BulkDelete):
+    """Delete many testimonials in one write"""
+    result = await bulk_delete(storage.testimonials, input.ids)
+    if result.succeeded:
+        await content_changed("testimonials")
+    return result
+
 @api_router.put("/testimonials/{testimonial_id}", response_model=Testimonial)
 async def update_testimonial(testimonial_id: str, input: TestimonialUpdate):
     """Update a testimonial"""
     update_data = {k: v for k, v in input.model_dump().items() if v is not None}
     if update_data:
-        result = await db.testimonials.update_one({"id": testimonial_id}, {"$set": update_data})
-        if result.matched_count == 0:
-            raise HTTPException(status_code=404, detail="Testimonial not found")
-    testimonial = await db.testimonials.find_one({"id": testimonial_id}, {"_id": 0})
+        testimonial = await storage.testimonials.update(testimonial_id, update_data)
+    else:
+        testimonial = await storage.testimonials.get(testimonial_id)
     if not testimonial:
         raise HTTPException(status_code=404, detail="Testimonial not found")
+    if update_data:
+        await content_changed("testimonials")
     return Testimonial(**testimonial)
 
 @api_router.delete("/testimonials/{testimonial_id}")
 async def delete_testimonial(testimonial_id: str):
     """Delete a testimonial"""
-    result = await db.testimonials.delete_one({"id": testimonial_id})
-    if result.deleted_count == 0:
+    if not await storage.testimonials.delete(testimonial_id):
         raise HTTPException(status_code=404, detail="Testimonial not found")
+    await content_changed("testimonials")
     return {"message": "Testimonial deleted successfully"}
 
 
 # ==================== INSIGHT ENDPOINTS ====================
 
-@api_router.get("/insights", response_model=List[Insight])
-async def get_insights():
-    """Get all published insights"""
-    insights = await db.insights.find({"isPublished": True}, {"_id": 0}).to_list(100)
-    return [Insight(**i) for i in insights]
-
-@api_router.get("/insights/all", response_model=List[Insight])
-async def get_all_insights():
-    """Get all insights (including unpublished)"""
-    insights = await db.insights.find({}, {"_id": 0}).to_list(100)
-    return [Insight(**i) for i in insights]
+async def read_insights() -> bytes:
+    insights = await storage.insights.list({"isPublished": True}, INSIGHT_SUMMARY_PROJECTION)
+    return encode_documents(InsightSummary, insights)
+
+async def load_insights() -> CachedBody:
+    return await response_cache.get_or_load("insights", read_insights)
+
+async def read_insight_categories() -> bytes:
+    return orjson.dumps(await storage.insights.category_counts())
+
+async def load_insight_categories() -> CachedBody:
+    """Published insights per category; dropped with every other insights entry on content_changed"""
+    return await response_cache.get_or_load("insights:categories", read_insight_categories)
+
+@api_router.get("/insights", response_model=List[InsightSummary])
+async def get_insights(request: Request, fields: Optional[str] = None):
+    """Get all published insights (without article bodies)"""
+    projection = field_projection(InsightSummary, fields)
+    if projection:
+        insights = await storage.insights.list({"isPublished": True}, projection)
+        return projected_response(request, encode_projected(insights))
+    return cached_response(request, await load_insights())
+
+@api_router.get("/insights/all", response_model=List[InsightSummary])
+async def get_all_insights(fields: Optional[str] = None):
+    """Get all insights, including unpublished (without article bodies)"""
+    projection = field_projection(InsightSummary, fields)
+    insights = await storage.insights.list({}, projection or INSIGHT_SUMMARY_PROJECTION)
+    if projection:
+        return json_response(encode_projected(insights))
+    return json_response(encode_documents(InsightSummary, insights))
+
+@api_router.post("/insights/bulk", response_model=BulkResult)
+async def create_insights_bulk(input: List[SkipValidation[InsightCreate]]):
+    """Create many insights in one write; each item is an InsightCreate, validated on its own"""
+    positions, items, rejected = validate_items(InsightCreate, input)
+    result = await bulk_insert(storage.insights, [Insight(**i.model_dump()) for i in items], positions, rejected)
+    if result.succeeded:
+        await content_changed("insights")
+    return result
+
+@api_router.patch("/insights/bulk", response_model=BulkResult)
+async def update_insights_bulk(input: List[SkipValidation[InsightPatch]]):
+    """Update many insights in one write; each item is an InsightPatch"""
+    positions, patches, rejected = validate_items(InsightPatch, input)
+    result = await bulk_update(storage.insights, patches, positions, rejected)
+    if result.succeeded:
+        await content_changed("insights")
+    return result
+
+@api_router.delete("/insights/bulk", response_model=BulkResult)
+async def delete_insights_bulk(input: BulkDelete):
+    """Delete many insights in one write"""
+    result = await bulk_delete(storage.insights, input.ids)
+    if result.succeeded:
+        await content_changed("insights")
+    return result
+
+@api_router.get("/insights/search", response_model=InsightSearchResult)
+async def search_insights(
+    q: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    fields: Optional[str] = None,
+):
+    """Search published insights by relevance, with per-category counts for the whole match set"""
+    projection = field_projection(InsightSummary, fields)
+    if q:
+        items, total, categories = await storage.insights.search(
+            q, category, limit, offset, projection or INSIGHT_SUMMARY_PROJECTION
+        )
+    else:
+        # Browsing: counts come from the cache, the page from an index walk
+        categories = orjson.loads((await load_insight_categories()).body)
+        in_category = [c for c in categories if c["category"] == category] if category else categories
+        total = sum(c["count"] for c in in_category)
+        items = await storage.insights.browse(
+            [c["category"] for c in in_category], limit, offset, projection or INSIGHT_SUMMARY_PROJECTION
+        )
+    body = b'{"items":%s,"total":%d,"categories":%s,"limit":%d,"offset":%d}' % (
+        encode_projected(items) if projection else encode_documents(InsightSummary, items),
+        total, orjson.dumps(categories), limit, offset,
+    )
+    return json_response(body)
 
 @api_router.get("/insights/{insight_id}", response_model=Insight)
-async def get_insight(insight_id: str):
-    """Get a single insight by ID"""
-    insight = await db.insights.find_one({"id": insight_id}, {"_id": 0})
+async def get_insight(insight_id: str, fields: Optional[str] = None):
+    """Get a single insight by ID, including the full article body"""
+    projection = field_projection(Insight, fields)
+    insight = await storage.insights.get(insight_id, projection)
     if not insight:
         raise HTTPException(status_code=404, detail="Insight not found")
-    return Insight(**insight)
+    if projection:
+        return json_response(encode_projected(insight))
+    return json_response(encode_document(Insight, insight))
 
 @api_router.post("/insights", response_model=Insight)
 async def create_insight(input: InsightCreate):
     """Create a new insight/article"""
     insight_obj = Insight(**input.model_dump())
-    await db.insights.insert_one(insight_obj.model_dump())
+    await storage.insights.insert(insight_obj.model_dump())
+    await content_changed("insights")
     return insight_obj
 
 @api_router.put("/insights/{insight_id}", response_model=Insight)
@@ -347,57 +1787,115 @@ async def update_insight(insight_id: str, input: InsightUpdate):
     """Update an insight"""
     update_data = {k: v for k, v in input.model_dump().items() if v is not None}
     if update_data:
-        result = await db.insights.update_one({"id": insight_id}, {"$set": update_data})
-        if result.matched_count == 0:
-            raise HTTPException(status_code=404, detail="Insight not found")
-    insight = await db.insights.find_one({"id": insight_id}, {"_id": 0})
+        insight = await storage.insights.update(insight_id, update_data)
+    else:
+        insight = await storage.insights.get(insight_id)
     if not insight:
         raise HTTPException(status_code=404, detail="Insight not found")
+    if update_data:
+        await content_changed("insights")
     return Insight(**insight)
 
 @api_router.delete("/insights/{insight_id}")
 async def delete_insight(insight_id: str):
     """Delete an insight"""
-    result = await db.insights.delete_one({"id": insight_id})
-    if result.deleted_count == 0:
+    if not await storage.insights.delete(insight_id):
         raise HTTPException(status_code=404, detail="Insight not found")
+    await content_changed("insights")
     return {"message": "Insight deleted successfully"}
 
 
 # ==================== PERFORMANCE ENDPOINTS ====================
 
-@api_router.get("/performance", response_model=Performance)
-async def get_performance():
-    """Get performance data"""
-    performance = await db.performance.find_one({}, {"_id": 0})
+def default_performance() -> Performance:
+    return Performance(
+        chartData=[
+            ChartDataPoint(month="Jan", portfolio=100, benchmark=100),
+            ChartDataPoint(month="Feb", portfolio=103.2, benchmark=101.5),
+            ChartDataPoint(month="Mar", portfolio=101.8, benchmark=99.2),
+            ChartDataPoint(month="Apr", portfolio=106.5, benchmark=102.8),
+            ChartDataPoint(month="May", portfolio=109.1, benchmark=104.1),
+            ChartDataPoint(month="Jun", portfolio=108.2, benchmark=103.5),
+            ChartDataPoint(month="Jul", portfolio=112.4, benchmark=106.2),
+            ChartDataPoint(month="Aug", portfolio=115.8, benchmark=107.8),
+            ChartDataPoint(month="Sep", portfolio=114.2, benchmark=105.9),
+            ChartDataPoint(month="Oct", portfolio=117.5, benchmark=108.4),
+            ChartDataPoint(month="Nov", portfolio=120.1, benchmark=110.2),
+            ChartDataPoint(month="Dec", portfolio=118.4, benchmark=109.5),
+        ],
+        allocation=[
+            AllocationItem(asset="Equities", percentage=40, color="#1e3a5a"),
+            AllocationItem(asset="Forex", percentage=25, color="#3b82f6"),
+            AllocationItem(asset="Cryptocurrency", percentage=20, color="#64748b"),
+            AllocationItem(asset="Options", percentage=10, color="#94a3b8"),
+            AllocationItem(asset="Cash", percentage=5, color="#cbd5e1"),
+        ]
+    )
+
+
+async def encode_performance(performance: dict) -> bytes:
+    """Encode the stored document; once a NAV series exists its chart replaces the stored chartData"""
+    chart_data = await build_chart_data("ALL", DEFAULT_CHART_POINTS)
+    if chart_data is not None:
+        performance = {**performance, "chartData": chart_data}
+    return encode_document(Performance, performance)
+
+async def read_performance() -> bytes:
+    performance = await storage.performance.get()
     if not performance:
-        # Return default performance data
-        default_performance = Performance(
-            chartData=[
-                ChartDataPoint(month="Jan", portfolio=100, benchmark=100),
-                ChartDataPoint(month="Feb", portfolio=103.2, benchmark=101.5),
-                ChartDataPoint(month="Mar", portfolio=101.8, benchmark=99.2),
-                ChartDataPoint(month="Apr", portfolio=106.5, benchmark=102.8),
-                ChartDataPoint(month="May", portfolio=109.1, benchmark=104.1),
-                ChartDataPoint(month="Jun", portfolio=108.2, benchmark=103.5),
-                ChartDataPoint(month="Jul", portfolio=112.4, benchmark=106.2),
-                ChartDataPoint(month="Aug", portfolio=115.8, benchmark=107.8),
-                ChartDataPoint(month="Sep", portfolio=114.2, benchmark=105.9),
-                ChartDataPoint(month="Oct", portfolio=117.5, benchmark=108.4),
-                ChartDataPoint(month="Nov", portfolio=120.1, benchmark=110.2),
-                ChartDataPoint(month="Dec", portfolio=118.4, benchmark=109.5),
-            ],
-            allocation=[
-                AllocationItem(asset="Equities", percentage=40, color="#1e3a5a"),
-                AllocationItem(asset="Forex", percentage=25, color="#3b82f6"),
-                AllocationItem(asset="Cryptocurrency", percentage=20, color="#64748b"),
-                AllocationItem(asset="Options", percentage=10, color="#94a3b8"),
-                AllocationItem(asset="Cash", percentage=5, color="#cbd5e1"),
-            ]
-        )
-        await db.performance.insert_one(default_performance.model_dump())
-        return default_performance
-    return Performance(**performance)
+        # Create the default performance document on first use, once even under concurrent requests
+        performance = await storage.performance.get_or_create(default_performance().model_dump())
+    return await encode_performance(performance)
+
+async def load_performance() -> CachedBody:
+    return await response_cache.get_or_load("performance", read_performance)
+
+@api_router.get("/performance", response_model=Performance)
+async def get_performance(
+    request: Request,
+    fields: Optional[str] = None,
+    points: Optional[int] = Query(
+        None, ge=3, le=MAX_CHART_POINTS,
+        description=f"Minimum number of chart points; rounded up to one of {', '.join(map(str, CHART_POINT_TIERS))}",
+    ),
+    chart_range: Optional[str] = Query(None, alias="range", pattern=CHART_RANGE_PATTERN),
+):
+    """Get performance data, with chartData downsampled from the NAV series once one is stored"""
+    projection = field_projection(Performance, fields)
+    if points is not None or chart_range is not None or (projection and "chartData" in projection):
+        return await get_performance_chart(request, projection, chart_range or "ALL", chart_points(points))
+    if projection:
+        performance = await storage.performance.get(projection)
+        if performance is None:
+            performance = await storage.performance.get_or_create(default_performance().model_dump(), projection)
+        return projected_response(request, encode_projected(performance))
+    return cached_response(request, await load_performance())
+
+def chart_points(requested: Optional[int]) -> int:
+    """Smallest resolution tier covering the requested number of points"""
+    if requested is None:
+        return DEFAULT_CHART_POINTS
+    return next(tier for tier in CHART_POINT_TIERS if tier >= requested)
+
+async def load_performance_chart(chart_range: str, points: int) -> CachedBody:
+    if (chart_range, points) == ("ALL", DEFAULT_CHART_POINTS):
+        return await load_performance()
+
+    async def read() -> bytes:
+        performance = orjson.loads((await load_performance()).body)
+        chart_data = await build_chart_data(chart_range, points)
+        if chart_data is not None:
+            performance["chartData"] = chart_data
+        return encode_document(Performance, performance)
+
+    return await response_cache.get_or_load(f"performance:{chart_range}:{points}", read)
+
+async def get_performance_chart(request: Request, projection: Optional[dict], chart_range: str, points: int) -> Response:
+    cached = await load_performance_chart(chart_range, points)
+    if projection:
+        performance = {k: v for k, v in orjson.loads(cached.body).items() if k in projection}
+        return projected_response(request, encode_projected(performance))
+    return cached_response(request, cached)
 
 @api_router.put("/performance", response_model=Performance)
 async def update_performance(input: PerformanceUpdate):
@@ -411,12 +1909,210 @@ async def update_performance(input: PerformanceUpdate):
         update_data['chartData'] = [c.model_dump() for c in input.chartData]
     if input.allocation:
         update_data['allocation'] = [a.model_dump() for a in input.allocation]
-    
-    if update_data:
-        await db.performance.update_one({}, {"$set": update_data}, upsert=True)
-    
-    performance = await db.performance.find_one({}, {"_id": 0})
-    return Performance(**performance)
+    if not update_data:
+        return Performance(**await storage.performance.get_or_create(default_performance().model_dump()))
+
+    performance = await storage.performance.set_fields(update_data, default_performance().model_dump())
+    performance_obj = Performance(**performance)
+    await content_changed("performance")
+    response_cache.set("performance", await encode_performance(performance))
+    return performance_obj
+
+
+@api_router.post("/performance/nav", response_model=NavIngestResult)
+async def ingest_nav(input: List[NavPoint]):
+    """Ingest daily portfolio and benchmark NAV points and refresh the summary metrics"""
+    if not input:
+        raise HTTPException(status_code=400, detail="No NAV points provided")
+    return await ingest_nav_points(input)
+
+
+# ==================== SITE BOOTSTRAP ENDPOINT ====================
+
+async def load_site() -> CachedBody:
+    profile, performance, testimonials, insights = await asyncio.gather(
+        load_profile(), load_performance(), load_testimonials(), load_insights()
+    )
+    # Splice the already-encoded parts together; the ETag changes whenever any part does
+    body = b'{"profile":%s,"performance":%s,"testimonials":%s,"insights":%s}' % (
+        profile.body, performance.body, testimonials.body, insights.body
+    )
+    etag = compute_etag("".join(part.etag for part in (profile, performance, testimonials, insights)).encode())
+    return CachedBody(body, etag)
+
+@api_router.get("/site", response_model=SiteContent)
+async def get_site(request: Request):
+    """Get all landing page content (profile, performance, testimonials, insights) in one response"""
+    return cached_response(request, await load_site())
+
+
+# ==================== STATIC SNAPSHOTS ====================
+
+# Bundle name -> loader of its API response body
+SNAPSHOT_LOADERS = {
+    "profile": load_profile,
+    "performance": load_performance,
+    "testimonials": load_testimonials,
+    "insights": load_insights,
+    "site": load_site,
+}
+
+# Bundles to regenerate after a write to each collection
+SNAPSHOT_DEPENDENTS = {
+    "profile": ("profile", "site"),
+    "performance": ("performance", "site"),
+    "testimonials": ("testimonials", "site"),
+    "insights": ("insights", "site"),
+}
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    # Readers see the old file or the new one, never a partial write
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_snapshot_files(directory: Path, bodies: Dict[str, CachedBody]) -> dict:
+    """Write each bundle as name.<version>.json (immutable) and name.json (latest), each with
+    .gz and .br siblings for gzip_static/brotli_static, then record them in manifest.json"""
+    manifest_path = directory / "manifest.json"
+    manifest = orjson.loads(manifest_path.read_bytes()) if manifest_path.exists() else {}
+    for name, cached in bodies.items():
+        version = cached.etag.strip('"')[:16]
+        variants = {".json": cached.body, ".json.gz": gzip.compress(cached.body, 9, mtime=0)}
+        if brotli is not None:
+            variants[".json.br"] = brotli.compress(cached.body, quality=11)
+        for suffix, data in variants.items():
+            write_atomic(directory / f"{name}.{version}{suffix}", data)
+            write_atomic(directory / f"{name}{suffix}", data)
+        # Keep a few previous versions for clients still holding an older manifest
+        previous = sorted(
+            (path for path in directory.glob(f"{name}.*.json") if path.name != f"{name}.{version}.json"),
+            key=lambda path: path.stat().st_mtime, reverse=True,
+        )
+        for path in previous[max(SNAPSHOT_KEEP_VERSIONS, 1) - 1:]:
+            for suffix in variants:
+                path.with_name(path.name[:-len(".json")] + suffix).unlink(missing_ok=True)
+        manifest[name] = {
+            "file": f"{name}.{version}.json",
+            "etag": cached.etag,
+            "bytes": len(cached.body),
+            "encodings": [suffix.rsplit(".", 1)[1] for suffix in variants if suffix != ".json"],
+            "generatedAt": datetime.now(timezone.utc).isoformat(),
+        }
+    write_atomic(manifest_path, orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    return manifest
+
+
+async def export_snapshots(directory: Path, names: Optional[List[str]] = None) -> dict:
+    """Render the given bundles (all by default) from storage and write them to directory"""
+    names = names or list(SNAPSHOT_LOADERS)
+    unknown = sorted(set(names) - set(SNAPSHOT_LOADERS))
+    if unknown:
+        raise ValueError(f"Unknown snapshots: {', '.join(unknown)}")
+    bodies = {name: await SNAPSHOT_LOADERS[name]() for name in names}
+    directory.mkdir(parents=True, exist_ok=True)
+    # Compression at the highest levels is CPU-heavy; keep it off the event loop
+    return await asyncio.to_thread(write_snapshot_files, directory, bodies)
+
+
+class SnapshotWriter:
+    """Regenerates the bundles affected by writes in the background, coalescing bursts of writes"""
+
+    def __init__(self, directory: str, debounce: float):
+        self.directory = Path(directory) if directory else None
+        self.debounce = debounce
+        self.regenerations = 0
+        self.errors = 0
+        self.last_duration_seconds = 0.0
+        self._dirty = set()
+        self._event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.directory is None:
+            return
+        self._dirty = set(SNAPSHOT_LOADERS)  # bring the directory up to date at startup
+        self._event = asyncio.Event()
+        self._event.set()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._dirty:
+            await self._regenerate()
+
+    def mark(self, names: Tuple[str, ...]) -> None:
+        if self._task is None:
+            return
+        self._dirty.update(names)
+        self._event.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._event.wait()
+            await asyncio.sleep(self.debounce)
+            self._event.clear()
+            await self._regenerate()
+
+    async def _regenerate(self) -> None:
+        names, self._dirty = sorted(self._dirty), set()
+        started = time.perf_counter()
+        try:
+            await export_snapshots(self.directory, names)
+            self.regenerations += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error("Snapshot regeneration of %s failed: %s", ", ".join(names), e)
+        self.last_duration_seconds = time.perf_counter() - started
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.directory is not None,
+            "directory": str(self.directory) if self.directory else None,
+            "pending": sorted(self._dirty),
+            "regenerations": self.regenerations,
+            "errors": self.errors,
+            "lastDurationMs": round(self.last_duration_seconds * 1000, 3),
+        }
+
+
+snapshot_writer = SnapshotWriter(SNAPSHOT_DIR, SNAPSHOT_DEBOUNCE_SECONDS)
+
+
+async def content_changed(name: str) -> None:
+    """Call after every successful write to profile, performance, testimonials or insights"""
+    await cache_sync.publish(name)
+    snapshot_writer.mark(SNAPSHOT_DEPENDENTS[name])
+
+
+# ==================== CACHE ENDPOINTS ====================
+
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    """Get read cache hit/miss counters and cross-worker invalidation state"""
+    return {**response_cache.stats(), "sync": cache_sync.stats(), "snapshots": snapshot_writer.stats()}
+
+@api_router.get("/ingest/stats")
+async def get_ingest_stats():
+    """Get write-behind queue depth and flush latency"""
+    return {
+        "enabled": WRITE_BEHIND_ENABLED,
+        "queues": {name: queue.stats() for name, queue in write_behind_queues.items()},
+    }
+
+@api_router.get("/notifications/stats")
+async def get_notification_stats():
+    """Get lead notification delivery counters and outbox entries per state"""
+    return {**notification_worker.stats(), "states": await storage.contact_notifications.counts()}
 
 
 # ==================== SEED DATA ENDPOINT ====================
@@ -426,8 +2122,8 @@ async def seed_database():
     """Seed database with initial data (testimonials and insights)"""
     
     # Check if data already exists
-    testimonials_count = await db.testimonials.count_documents({})
-    insights_count = await db.insights.count_documents({})
+    testimonials_count = await storage.testimonials.count()
+    insights_count = await storage.insights.count()
     
     seeded = {"testimonials": 0, "insights": 0}
     
@@ -453,9 +2149,9 @@ async def seed_database():
                 rating=5
             )
         ]
-        for t in default_testimonials:
-            await db.testimonials.insert_one(t.model_dump())
-        seeded["testimonials"] = len(default_testimonials)
+        result = await bulk_insert(storage.testimonials, default_testimonials)
+        seeded["testimonials"] = result.succeeded
+        await content_changed("testimonials")
     
     # Seed insights if empty
     if insights_count == 0:
@@ -485,12 +2181,421 @@ async def seed_database():
                 readTime="10 min read"
             )
         ]
-        for i in default_insights:
-            await db.insights.insert_one(i.model_dump())
-        seeded["insights"] = len(default_insights)
+        result = await bulk_insert(storage.insights, default_insights)
+        seeded["insights"] = result.succeeded
+        await content_changed("insights")
     
     return {"message": "Database seeded successfully", "seeded": seeded}
 
+logger = logging.getLogger(__name__)
+
+# ==================== METRICS ====================
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies", ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+# Gauges sum over live workers when metrics are aggregated across processes
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ["method", "route"],
+    multiprocess_mode="livesum",
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round-trip time", ["collection", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+MONGO_COMMAND_ERRORS = Counter(
+    "mongo_command_errors_total", "MongoDB commands that failed", ["collection", "command"]
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections", "Open connections in the MongoDB pool", ["address"], multiprocess_mode="livesum"
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongo_pool_checked_out_connections", "Pooled MongoDB connections currently in use", ["address"],
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total", "Failed MongoDB connection checkouts", ["address", "reason"]
+)
+MONGO_POOL_CLEARED = Counter(
+    "mongo_pool_cleared_total", "MongoDB pool clears (connections dropped after an error)", ["address"]
+)
+MONGO_POOL_MAX_SIZE = Gauge("mongo_pool_max_size", "Configured MongoDB maxPoolSize (per worker)", multiprocess_mode="livemax")
+CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total",
+    "Response cache lookups by outcome (collapsed: waited on another request's load instead of querying)",
+    ["cache", "result"],
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose: every worker's samples from PROMETHEUS_MULTIPROC_DIR, or this process's"""
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, PROMETHEUS_MULTIPROC_DIR)
+    return registry
+
+
+class RouteTemplates:
+    """Route template (e.g. /api/insights/{insight_id}) a request path is served by"""
+
+    def __init__(self, router: APIRouter):
+        self.router = router
+        # Matching every route costs tens of microseconds; most traffic repeats a few paths
+        self.lookup = functools.lru_cache(maxsize=4096)(self._match)
+
+    def _match(self, method: str, path: str) -> str:
+        # Label by template, never by raw path, so ids and scanners cannot blow up label cardinality
+        scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+        partial = None
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """Count, time and track in-flight requests per route template"""
+
+    def __init__(self, app: ASGIApp, routes: RouteTemplates):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self.routes.lookup(method, scope["path"])
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            in_flight.dec()
+
+
+def command_collection(event: monitoring.CommandStartedEvent) -> str:
+    target = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+    return target if isinstance(target, str) else ""
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Time every MongoDB command by collection and command name (called on driver threads)"""
+
+    def __init__(self):
+        self._collections: Dict[Tuple[object, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        # Only the started event carries the command document, so remember its collection
+        self._collections[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_ERRORS.labels(collection, event.command_name).inc()
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Track open and checked-out connections per server from pool events"""
+
+    @staticmethod
+    def _address(event) -> str:
+        return "%s:%s" % event.address
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        MONGO_POOL_CLEARED.labels(self._address(event)).inc()
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(self._address(event), str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).dec()
+
+
+# ==================== LOGGING ====================
+
+# Mongo commands run on behalf of the current request, for the slow-request log (None = not recording)
+request_mongo_ops: contextvars.ContextVar[Optional[List[dict]]] = contextvars.ContextVar("request_mongo_ops", default=None)
+
+access_logger = logging.getLogger("server.access")
+slow_logger = logging.getLogger("server.slow")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any fields passed with extra="""
+
+    STANDARD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((k, v) for k, v in vars(record).items() if k not in self.STANDARD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a listener in the same process.
+
+    The stock prepare() renders the traceback into msg and drops exc_info, which both runs
+    the formatting on the event loop and hides the exception from JsonFormatter. Only the
+    message is fixed here (its args may change later); exc_info goes to the listener as is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+
+def configure_logging() -> Optional[logging.handlers.QueueListener]:
+    """Route all records through a queue to a listener thread that formats and writes them, so the
+    event loop never blocks on log output. Like basicConfig, a no-op if logging is already set up."""
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    records = SimpleQueue()
+    listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    root.addHandler(LocalQueueHandler(records))
+    root.setLevel(LOG_LEVEL)
+    # uvicorn installs synchronous handlers on its own loggers before importing the app
+    for name in ("uvicorn", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+log_listener = configure_logging()
+if ACCESS_LOG_ENABLED:
+    # AccessLogMiddleware already logs every request; keep uvicorn from logging each one a second time
+    logging.getLogger("uvicorn.access").disabled = True
+
+
+class MongoCommandTrace(monitoring.CommandListener):
+    """Record each command's collection, name and duration on the request that ran it.
+
+    Motor runs commands on executor threads with the calling task's context copied in,
+    so request_mongo_ops still refers to the originating request's list here.
+    """
+
+    def __init__(self):
+        self._collections: Dict[Tuple[object, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if request_mongo_ops.get() is not None:
+            self._collections[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def _record(self, event, failed: bool) -> None:
+        ops = request_mongo_ops.get()
+        if ops is None:
+            return
+        ops.append({
+            "collection": self._collections.pop((event.connection_id, event.request_id), ""),
+            "command": event.command_name,
+            "durationMs": round(event.duration_micros / 1000, 3),
+            **({"failed": True} if failed else {}),
+        })
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._record(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._record(event, failed=True)
+
+
+class AccessLogMiddleware:
+    """Log each request's route template, status, response bytes and duration, and for requests
+    slower than slow_ms, the Mongo commands they ran (duration includes streamed bodies)"""
+
+    def __init__(self, app: ASGIApp, routes: RouteTemplates, access_log: bool, slow_ms: float):
+        self.app = app
+        self.routes = routes
+        self.access_log = access_log
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        size = 0
+
+        async def send_with_size(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        ops = [] if self.slow_ms else None
+        token = request_mongo_ops.set(ops)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_size)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            request_mongo_ops.reset(token)
+            fields = {
+                "method": scope["method"],
+                "route": self.routes.lookup(scope["method"], scope["path"]),
+                "path": scope["path"],
+                "status": status,
+                "bytes": size,
+                "durationMs": round(duration_ms, 3),
+            }
+            if self.access_log:
+                access_logger.info("%s %s %d %.1fms", fields["method"], fields["path"], status, duration_ms, extra=fields)
+            if self.slow_ms and duration_ms >= self.slow_ms:
+                slow_logger.warning(
+                    "Slow request %s %s took %.1fms (%d Mongo commands, %.1fms)",
+                    fields["method"], fields["path"], duration_ms, len(ops), sum(op["durationMs"] for op in ops),
+                    extra={**fields, "mongoCommands": len(ops), "mongoOps": ops[:SLOW_REQUEST_MAX_OPS]},
+                )
+
+
+# ==================== APP LIFESPAN ====================
+
+def create_mongo_client() -> AsyncIOMotorClient:
+    options = {
+        # tz_aware so BSON dates come back as UTC-aware datetimes
+        "tz_aware": True,
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS or None,
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    listeners = []
+    if METRICS_ENABLED:
+        listeners += [MongoCommandMetrics(), MongoPoolMetrics()]
+        MONGO_POOL_MAX_SIZE.set(MONGO_MAX_POOL_SIZE)
+    if SLOW_REQUEST_MS:
+        listeners.append(MongoCommandTrace())
+    if listeners:
+        options["event_listeners"] = listeners
+    return AsyncIOMotorClient(os.environ['MONGO_URL'], **options)
+
+
+async def warm_up_mongo():
+    """Ping the server, opening several pooled connections so early requests skip the handshake"""
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(max(1, MONGO_WARMUP_CONNECTIONS))))
+
+
+@asynccontextmanager
+async def open_storage() -> AsyncIterator[Storage]:
+    """Connect the configured storage backend for the duration of the block (app or CLI)"""
+    global client, storage
+    if STORAGE_BACKEND == "memory":
+        storage = MemoryStorage(STATUS_CHECK_RETENTION_SECONDS)
+    else:
+        client = create_mongo_client()
+        await warm_up_mongo()
+        storage = MongoStorage(client[os.environ['DB_NAME']], STATUS_CHECK_RETENTION_SECONDS)
+    try:
+        yield storage
+    finally:
+        await storage.close()
+        if client is not None:
+            client.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    async with open_storage():
+        connected = time.perf_counter()
+        await storage.prepare()
+        await cache_sync.start()
+        if WRITE_BEHIND_ENABLED:
+            for queue in write_behind_queues.values():
+                queue.start()
+        snapshot_writer.start()
+        notification_worker.start()
+        app.state.startup_seconds = time.perf_counter() - started
+        logger.info(
+            "Startup completed in %.1f ms (%s storage, connect and warmup %.1f ms)",
+            app.state.startup_seconds * 1000, STORAGE_BACKEND, (connected - started) * 1000,
+        )
+        try:
+            yield
+        finally:
+            # Drain queued writes and pending snapshots before the client goes away
+            for queue in write_behind_queues.values():
+                await queue.stop()
+            await notification_worker.stop()
+            await snapshot_writer.stop()
+            await cache_sync.stop()
+            if PROMETHEUS_MULTIPROC_DIR:
+                # Drop this worker's live gauges (in-flight, pool) from the aggregate
+                multiprocess.mark_process_dead(os.getpid(), PROMETHEUS_MULTIPROC_DIR)
+
+
+# Create the main app without a prefix
+app = FastAPI(lifespan=lifespan)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -502,13 +2607,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+route_templates = RouteTemplates(app.router)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, routes=route_templates)
+
+    scrape_registry = metrics_registry()
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint"""
+        return Response(content=generate_latest(scrape_registry), media_type=CONTENT_TYPE_LATEST)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+if ACCESS_LOG_ENABLED or SLOW_REQUEST_MS:
+    app.add_middleware(AccessLogMiddleware, routes=route_templates, access_log=ACCESS_LOG_ENABLED, slow_ms=SLOW_REQUEST_MS)
@@ -0,0 +1,1088 @@
+"""
+Storage backends for the Juniper Broz API.
+
+Handlers in server.py talk to repositories (one per kind of data) rather than to motor
+collections, so the API can run against MongoDB or, for tests and benchmarks, entirely
+in process memory. Repositories take and return plain documents: dicts shaped like the
+API models, never carrying Mongo's _id.
+"""
+
+import asyncio
+import copy
+import logging
+import re
+import uuid
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Position of an event document in (timestamp, id) keyset order
+EventKey = Tuple[datetime, str]
+
+# Field weights for insight relevance ranking (text index weights on Mongo)
+INSIGHT_TEXT_WEIGHTS = {"title": 10, "excerpt": 4, "content": 1}
+
+
+# ==================== REPOSITORY INTERFACES ====================
+
+class SingletonRepository:
+    """A collection holding one settings-style document (profile, performance)"""
+
+    async def get(self, projection: Optional[dict] = None) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def get_or_create(self, default: dict, projection: Optional[dict] = None) -> dict:
+        """The document, inserting default first if there is none (in one atomic step)"""
+        raise NotImplementedError
+
+    async def set_fields(self, fields: dict, default: dict) -> dict:
+        """$set fields and return the updated document; with no document yet, insert default
+        with fields applied (in one atomic step)"""
+        raise NotImplementedError
+
+
+class ContentRepository:
+    """Admin-managed documents addressed by their id (testimonials, insights)"""
+
+    async def list(self, filter: dict, projection: Optional[dict] = None, limit: int = 100) -> List[dict]:
+        """Documents whose fields equal every value in filter, in insertion order"""
+        raise NotImplementedError
+
+    async def get(self, doc_id: str, projection: Optional[dict] = None) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def count(self) -> int:
+        raise NotImplementedError
+
+    async def existing_ids(self, ids: List[str]) -> Set[str]:
+        raise NotImplementedError
+
+    async def insert(self, doc: dict) -> None:
+        raise NotImplementedError
+
+    async def insert_many(self, docs: List[dict]) -> Dict[int, str]:
+        """Insert all documents that can be; returns error messages by position"""
+        raise NotImplementedError
+
+    async def update(self, doc_id: str, fields: dict) -> Optional[dict]:
+        """$set fields on one document and return it as updated; None if it does not exist"""
+        raise NotImplementedError
+
+    async def update_many(self, updates: List[Tuple[str, dict]]) -> Dict[int, str]:
+        """Apply (id, fields) updates in one batch; returns error messages by position"""
+        raise NotImplementedError
+
+    async def delete(self, doc_id: str) -> bool:
+        raise NotImplementedError
+
+    async def delete_many(self, ids: List[str]) -> None:
+        raise NotImplementedError
+
+
+class InsightRepository(ContentRepository):
+
+    async def search(
+        self, q: str, category: Optional[str], limit: int, offset: int, projection: dict
+    ) -> Tuple[List[dict], int, List[dict]]:
+        """Published insights matching the text query q, ranked by relevance.
+
+        Returns (page of items, total in category, [{category, count}] over all matches).
+        """
+        raise NotImplementedError
+
+    async def browse(self, categories: List[str], limit: int, offset: int, projection: dict) -> List[dict]:
+        """A page of the published insights in any of categories, newest first"""
+        raise NotImplementedError
+
+    async def category_counts(self) -> List[dict]:
+        """[{category, count}] over all published insights, largest first"""
+        raise NotImplementedError
+
+
+class EventRepository:
+    """Append-mostly, timestamped documents read newest first (contacts, status checks)"""
+
+    async def insert(self, doc: dict) -> None:
+        raise NotImplementedError
+
+    async def insert_many(self, docs: List[dict]) -> Dict[int, str]:
+        raise NotImplementedError
+
+    async def page(
+        self, since: Optional[datetime], until: Optional[datetime], after: Optional[EventKey],
+        limit: int, projection: Optional[dict] = None,
+    ) -> List[dict]:
+        """Up to limit documents in [since, until) positioned before after, newest first"""
+        raise NotImplementedError
+
+    def stream(
+        self, since: Optional[datetime], until: Optional[datetime], after: Optional[EventKey],
+        projection: Optional[dict] = None, batch_size: int = 500,
+    ) -> AsyncIterator[dict]:
+        """Every document page() would return, without a limit, fetched batch_size at a time"""
+        raise NotImplementedError
+
+
+class RollupRepository:
+    """Pre-aggregated counters, one per (granularity, bucket start, dimension values)"""
+
+    async def increment(self, updates: List[Tuple[dict, int, Optional[datetime]]]) -> None:
+        """Add count to the counter identified by key for each (key, count, expires_at),
+        creating missing counters; expires_at (if given) is when a new counter may be dropped"""
+        raise NotImplementedError
+
+    async def find(
+        self, granularity: str, since: datetime, until: datetime, match: Optional[dict] = None
+    ) -> List[dict]:
+        """Counters of one granularity with bucket in [since, until), oldest first"""
+        raise NotImplementedError
+
+    async def rebuild(
+        self, source: EventRepository, dimension: str, granularities: List[str],
+        known: Tuple[str, ...], missing: str, other: str,
+    ) -> int:
+        """Replace every counter with counts recomputed from all documents in source, per
+        granularity bucket of their timestamp and rollup_value of dimension; returns the
+        number of counters. Increments made while it runs may be lost."""
+        raise NotImplementedError
+
+
+class OutboxRepository:
+    """Delivery state embedded in event documents ({state, attempts, nextAttemptAt, lastError}),
+    so queuing a notification costs no write beyond the event's own insert.
+
+    state is "pending" until delivered ("sent") or given up on ("dead"). A claimed document
+    stays pending with nextAttemptAt pushed to the lease end, so one whose worker dies is
+    claimed again once the lease runs out.
+    """
+
+    async def claim(self, now: datetime, lease_until: datetime, limit: int) -> List[dict]:
+        """Claim up to limit pending documents due by now, earliest first, counting an attempt"""
+        raise NotImplementedError
+
+    async def complete(self, doc_id: str, at: datetime) -> None:
+        raise NotImplementedError
+
+    async def retry(self, doc_id: str, next_attempt_at: datetime, error: str) -> None:
+        raise NotImplementedError
+
+    async def dead_letter(self, doc_id: str, at: datetime, error: str) -> None:
+        raise NotImplementedError
+
+    async def requeue_dead(self, now: datetime) -> int:
+        """Make every dead document pending again with a fresh attempt budget; returns how many"""
+        raise NotImplementedError
+
+    async def counts(self) -> Dict[str, int]:
+        """Number of documents per delivery state"""
+        raise NotImplementedError
+
+
+def rollup_value(value: Optional[str], known: Tuple[str, ...], missing: str, other: str) -> str:
+    """Counter key for a free-text dimension value: missing when null or blank, other when not
+    one of known (compared trimmed and lower-cased), so the number of counters stays bounded"""
+    value = (value or "").strip().lower()
+    if not value:
+        return missing
+    return value if value in known else other
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Start (UTC) of the minute, hour, day or Monday-based week containing timestamp"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    start = timestamp.astimezone(timezone.utc).replace(second=0, microsecond=0)
+    if granularity == "minute":
+        return start
+    start = start.replace(minute=0)
+    if granularity == "hour":
+        return start
+    start = start.replace(hour=0)
+    if granularity == "day":
+        return start
+    return start - timedelta(days=start.weekday())
+
+
+class NavRepository:
+    """Yearly NAV buckets ({_id: year, count, days, portfolio, benchmark}) and running metric state"""
+
+    async def get_buckets(self, years: Optional[List[int]] = None, from_year: Optional[int] = None) -> List[dict]:
+        """Buckets ordered by year, optionally only the given years or those from from_year on"""
+        raise NotImplementedError
+
+    async def save_buckets(self, buckets: List[dict]) -> None:
+        raise NotImplementedError
+
+    async def get_stats(self) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def save_stats(self, stats: dict) -> None:
+        raise NotImplementedError
+
+
+class VersionRepository:
+    """Per-name change counters shared by every API worker, used to invalidate their caches"""
+
+    async def bump(self, name: str) -> int:
+        """Atomically increment a counter, returning its new value"""
+        raise NotImplementedError
+
+    async def get_all(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def watch(self) -> AsyncIterator[Tuple[str, int]]:
+        """Current (name, version) pairs, then every bump as it happens.
+
+        Raises NotImplementedError (or the driver's error) where change notifications are unavailable.
+        """
+        raise NotImplementedError
+
+
+class Storage:
+    """The repositories the API uses, plus backend lifecycle hooks"""
+
+    profile: SingletonRepository
+    performance: SingletonRepository
+    testimonials: ContentRepository
+    insights: InsightRepository
+    contacts: EventRepository
+    contact_notifications: OutboxRepository
+    status_checks: EventRepository
+    contact_rollups: RollupRepository
+    status_rollups: RollupRepository
+    nav: NavRepository
+    versions: VersionRepository
+
+    async def prepare(self) -> None:
+        """Run once at startup before serving requests"""
+
+    async def close(self) -> None:
+        """Release backend resources at shutdown"""
+
+
+# ==================== MONGODB BACKEND ====================
+
+# Every index the API relies on, by collection; names are explicit so reruns are no-ops
+INDEXES = {
+    "testimonials": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("isActive", ASCENDING)], name="isActive"),
+    ],
+    "insights": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("isPublished", ASCENDING), ("category", ASCENDING), ("date", DESCENDING)],
+            name="isPublished_category_date",
+        ),
+        # Newest-first browsing; date is a display string ("October 18, 2026") that does not sort
+        IndexModel([("isPublished", ASCENDING), ("category", ASCENDING), ("_id", DESCENDING)], name="isPublished_category_id"),
+        IndexModel(
+            [("title", TEXT), ("excerpt", TEXT), ("content", TEXT)],
+            name="title_excerpt_content_text",
+            weights=INSIGHT_TEXT_WEIGHTS,
+        ),
+    ],
+    "contacts": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id"),
+        IndexModel(
+            [("notification.state", ASCENDING), ("notification.nextAttemptAt", ASCENDING)],
+            name="notification_state_nextAttemptAt",
+        ),
+    ],
+    "status_checks": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id"),
+    ],
+    "contact_rollups": [
+        IndexModel(
+            [("granularity", ASCENDING), ("bucket", ASCENDING), ("investmentGoal", ASCENDING)],
+            name="granularity_bucket_goal_unique", unique=True,
+        ),
+    ],
+    "status_rollups": [
+        IndexModel(
+            [("granularity", ASCENDING), ("bucket", ASCENDING), ("client_name", ASCENDING)],
+            name="granularity_bucket_client_unique", unique=True,
+        ),
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0),
+    ],
+    # No document has this field, so all index as null and a second singleton cannot be inserted
+    "profile": [IndexModel([("singleton", ASCENDING)], name="singleton_unique", unique=True)],
+    "performance": [IndexModel([("singleton", ASCENDING)], name="singleton_unique", unique=True)],
+}
+
+SINGLETON_COLLECTIONS = ("profile", "performance")
+
+TIMESTAMP_MIGRATION_BATCH_SIZE = 1000
+
+# Newest first; id breaks ties between documents sharing a timestamp
+KEYSET_SORT = [("timestamp", DESCENDING), ("id", DESCENDING)]
+
+
+def write_errors(error: BulkWriteError, positions: Optional[List[int]] = None) -> Dict[int, str]:
+    """Per-operation error messages from a BulkWriteError, keyed by caller position"""
+    return {
+        (positions[err["index"]] if positions else err["index"]): err.get("errmsg", "Write failed")
+        for err in error.details.get("writeErrors", [])
+    }
+
+
+def is_exclusion(projection: dict) -> bool:
+    return all(not value for key, value in projection.items() if key != "_id")
+
+
+class MongoSingletonRepository(SingletonRepository):
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def get(self, projection=None):
+        return await self.collection.find_one({}, projection or {"_id": 0})
+
+    async def _upsert(self, update: dict, projection: Optional[dict]) -> dict:
+        options = dict(projection=projection or {"_id": 0}, upsert=True, return_document=ReturnDocument.AFTER)
+        try:
+            return await self.collection.find_one_and_update({}, update, **options)
+        except DuplicateKeyError:
+            # A concurrent first request inserted the document; it now matches, so apply to that
+            return await self.collection.find_one_and_update({}, update, **options)
+
+    async def get_or_create(self, default, projection=None):
+        return await self._upsert({"$setOnInsert": default}, projection)
+
+    async def set_fields(self, fields, default):
+        # An update operator may not be empty, nor may both operators name the same field
+        update = {}
+        on_insert = {k: v for k, v in default.items() if k not in fields}
+        if on_insert:
+            update["$setOnInsert"] = on_insert
+        if fields:
+            update["$set"] = fields
+        return await self._upsert(update, None)
+
+
+class MongoContentRepository(ContentRepository):
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def list(self, filter, projection=None, limit=100):
+        return await self.collection.find(filter, projection or {"_id": 0}).to_list(limit)
+
+    async def get(self, doc_id, projection=None):
+        return await self.collection.find_one({"id": doc_id}, projection or {"_id": 0})
+
+    async def count(self):
+        return await self.collection.count_documents({})
+
+    async def existing_ids(self, ids):
+        docs = await self.collection.find({"id": {"$in": ids}}, {"_id": 0, "id": 1}).to_list(None)
+        return {doc["id"] for doc in docs}
+
+    async def insert(self, doc):
+        await self.collection.insert_one(dict(doc))
+
+    async def insert_many(self, docs):
+        if not docs:
+            return {}
+        try:
+            await self.collection.insert_many([dict(doc) for doc in docs], ordered=False)
+        except BulkWriteError as e:
+            return write_errors(e)
+        return {}
+
+    async def update(self, doc_id, fields):
+        return await self.collection.find_one_and_update(
+            {"id": doc_id}, {"$set": fields}, projection={"_id": 0}, return_document=ReturnDocument.AFTER
+        )
+
+    async def update_many(self, updates):
+        if not updates:
+            return {}
+        try:
+            await self.collection.bulk_write(
+                [UpdateOne({"id": doc_id}, {"$set": fields}) for doc_id, fields in updates], ordered=False
+            )
+        except BulkWriteError as e:
+            return write_errors(e)
+        return {}
+
+    async def delete(self, doc_id):
+        result = await self.collection.delete_one({"id": doc_id})
+        return result.deleted_count > 0
+
+    async def delete_many(self, ids):
+        await self.collection.delete_many({"id": {"$in": ids}})
+
+
+class MongoInsightRepository(MongoContentRepository, InsightRepository):
+
+    async def search(self, q, category, limit, offset, projection):
+        in_category = [{"$match": {"category": category}}] if category else []
+        if is_exclusion(projection):
+            projection = {**projection, "score": 0}
+        pipeline = [
+            {"$match": {"isPublished": True, "$text": {"$search": q}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+            {"$facet": {
+                "items": in_category + [
+                    {"$sort": {"score": -1, "_id": -1}},
+                    {"$skip": offset},
+                    {"$limit": limit},
+                    {"$project": projection},
+                ],
+                "total": in_category + [{"$count": "count"}],
+                "categories": [
+                    {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                ],
+            }},
+        ]
+        result = (await self.collection.aggregate(pipeline).to_list(1))[0]
+        total = result["total"][0]["count"] if result["total"] else 0
+        categories = [{"category": c["_id"], "count": c["count"]} for c in result["categories"]]
+        return result["items"], total, categories
+
+    async def browse(self, categories, limit, offset, projection):
+        # Equality on each category lets the index walk them in _id order and merge, with no sort stage
+        cursor = self.collection.find({"isPublished": True, "category": {"$in": categories}}, projection)
+        cursor = cursor.sort("_id", DESCENDING).hint("isPublished_category_id").skip(offset).limit(limit)
+        return await cursor.to_list(limit)
+
+    async def category_counts(self):
+        rows = await self.collection.aggregate([
+            {"$match": {"isPublished": True}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]).to_list(None)
+        return [{"category": row["_id"], "count": row["count"]} for row in rows]
+
+
+class MongoEventRepository(EventRepository):
+
+    def __init__(self, collection, hidden: Tuple[str, ...] = ()):
+        self.collection = collection
+        # Internal fields left out of reads that do not ask for specific fields
+        self.default_projection = {"_id": 0, **{field: 0 for field in hidden}}
+
+    @staticmethod
+    def _query(since, until, after) -> dict:
+        query = {}
+        bounds = {}
+        if since is not None:
+            bounds["$gte"] = since
+        if until is not None:
+            bounds["$lt"] = until
+        if bounds:
+            query["timestamp"] = bounds
+        if after is not None:
+            timestamp, doc_id = after
+            query["$or"] = [
+                {"timestamp": {"$lt": timestamp}},
+                {"timestamp": timestamp, "id": {"$lt": doc_id}},
+            ]
+        return query
+
+    async def insert(self, doc):
+        await self.collection.insert_one(dict(doc))
+
+    async def insert_many(self, docs):
+        try:
+            await self.collection.insert_many([dict(doc) for doc in docs], ordered=False)
+        except BulkWriteError as e:
+            return write_errors(e)
+        return {}
+
+    async def page(self, since, until, after, limit, projection=None):
+        cursor = self.collection.find(self._query(since, until, after), projection or self.default_projection)
+        return await cursor.sort(KEYSET_SORT).limit(limit).to_list(limit)
+
+    async def stream(self, since, until, after, projection=None, batch_size=500):
+        cursor = self.collection.find(self._query(since, until, after), projection or self.default_projection)
+        async for doc in cursor.sort(KEYSET_SORT).batch_size(batch_size):
+            yield doc
+
+
+class MongoOutboxRepository(OutboxRepository):
+
+    def __init__(self, collection, field: str):
+        self.collection = collection
+        self.field = field
+
+    async def claim(self, now, lease_until, limit):
+        state, next_attempt = f"{self.field}.state", f"{self.field}.nextAttemptAt"
+        due = {state: "pending", next_attempt: {"$lte": now}}
+        candidates = await self.collection.find(due, {"_id": 1}).sort(next_attempt, ASCENDING).limit(limit).to_list(limit)
+        if not candidates:
+            return []
+        # Re-check due in the update so a candidate taken by another worker meanwhile is skipped
+        ids = [doc["_id"] for doc in candidates]
+        token = uuid.uuid4().hex
+        await self.collection.update_many(
+            {"_id": {"$in": ids}, **due},
+            {"$set": {next_attempt: lease_until, f"{self.field}.claim": token}, "$inc": {f"{self.field}.attempts": 1}},
+        )
+        return await self.collection.find({"_id": {"$in": ids}, f"{self.field}.claim": token}, {"_id": 0}).to_list(None)
+
+    async def _set(self, doc_id: str, fields: dict, unset: Tuple[str, ...]) -> None:
+        await self.collection.update_one(
+            {"id": doc_id},
+            {"$set": {f"{self.field}.{k}": v for k, v in fields.items()},
+             "$unset": {f"{self.field}.{k}": "" for k in unset}},
+        )
+
+    async def complete(self, doc_id, at):
+        await self._set(doc_id, {"state": "sent", "sentAt": at}, ("nextAttemptAt", "claim", "lastError"))
+
+    async def retry(self, doc_id, next_attempt_at, error):
+        await self._set(doc_id, {"nextAttemptAt": next_attempt_at, "lastError": error}, ("claim",))
+
+    async def dead_letter(self, doc_id, at, error):
+        await self._set(doc_id, {"state": "dead", "deadAt": at, "lastError": error}, ("nextAttemptAt", "claim"))
+
+    async def requeue_dead(self, now):
+        result = await self.collection.update_many(
+            {f"{self.field}.state": "dead"},
+            {"$set": {f"{self.field}.state": "pending", f"{self.field}.attempts": 0, f"{self.field}.nextAttemptAt": now},
+             "$unset": {f"{self.field}.deadAt": ""}},
+        )
+        return result.modified_count
+
+    async def counts(self):
+        rows = await self.collection.aggregate([
+            {"$match": {f"{self.field}.state": {"$exists": True}}},
+            {"$group": {"_id": f"${self.field}.state", "count": {"$sum": 1}}},
+        ]).to_list(None)
+        return {row["_id"]: row["count"] for row in rows}
+
+
+class MongoRollupRepository(RollupRepository):
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def increment(self, updates):
+        operations = []
+        for key, count, expires_at in updates:
+            update = {"$inc": {"count": count}}
+            if expires_at is not None:
+                update["$setOnInsert"] = {"expiresAt": expires_at}
+            operations.append(UpdateOne(key, update, upsert=True))
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def find(self, granularity, since, until, match=None):
+        query = {"granularity": granularity, "bucket": {"$gte": since, "$lt": until}, **(match or {})}
+        cursor = self.collection.find(query, {"_id": 0, "expiresAt": 0}).sort("bucket", ASCENDING)
+        return await cursor.to_list(None)
+
+    async def rebuild(self, source, dimension, granularities, known, missing, other):
+        def truncate(granularity):
+            if granularity == "week":
+                return {"$dateTrunc": {"date": "$timestamp", "unit": "week", "startOfWeek": "monday"}}
+            return {"$dateTrunc": {"date": "$timestamp", "unit": granularity}}
+
+        # $out swaps the recomputed counters in atomically and keeps the collection's indexes
+        await source.collection.aggregate([
+            {"$project": {
+                "_id": 0,
+                # Same mapping as rollup_value
+                "value": {"$let": {
+                    "vars": {"value": {"$toLower": {"$trim": {"input": {"$ifNull": [f"${dimension}", ""]}}}}},
+                    "in": {"$switch": {
+                        "branches": [
+                            {"case": {"$eq": ["$$value", ""]}, "then": missing},
+                            {"case": {"$in": ["$$value", list(known)]}, "then": "$$value"},
+                        ],
+                        "default": other,
+                    }},
+                }},
+                "buckets": [{"granularity": granularity, "bucket": truncate(granularity)} for granularity in granularities],
+            }},
+            {"$unwind": "$buckets"},
+            {"$group": {
+                "_id": {"granularity": "$buckets.granularity", "bucket": "$buckets.bucket", "value": "$value"},
+                "count": {"$sum": 1},
+            }},
+            {"$project": {
+                "_id": 0, "granularity": "$_id.granularity", "bucket": "$_id.bucket", dimension: "$_id.value", "count": 1,
+            }},
+            {"$out": self.collection.name},
+        ]).to_list(None)
+        return await self.collection.count_documents({})
+
+
+class MongoNavRepository(NavRepository):
+    STATS_ID = "portfolio"
+
+    def __init__(self, series, stats):
+        self.series = series
+        self.stats = stats
+
+    async def get_buckets(self, years=None, from_year=None):
+        query = {}
+        if years is not None:
+            query["_id"] = {"$in": years}
+        elif from_year is not None:
+            query["_id"] = {"$gte": from_year}
+        return await self.series.find(query).sort("_id", ASCENDING).to_list(None)
+
+    async def save_buckets(self, buckets):
+        await self.series.bulk_write([ReplaceOne({"_id": b["_id"]}, b, upsert=True) for b in buckets], ordered=False)
+
+    async def get_stats(self):
+        return await self.stats.find_one({"_id": self.STATS_ID}, {"_id": 0})
+
+    async def save_stats(self, stats):
+        await self.stats.replace_one({"_id": self.STATS_ID}, {"_id": self.STATS_ID, **stats}, upsert=True)
+
+
+class MongoVersionRepository(VersionRepository):
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def bump(self, name):
+        doc = await self.collection.find_one_and_update(
+            {"_id": name}, {"$inc": {"version": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return doc["version"]
+
+    async def get_all(self):
+        return {doc["_id"]: doc["version"] async for doc in self.collection.find({})}
+
+    async def watch(self):
+        # Needs a replica set or sharded cluster; standalone servers raise OperationFailure here
+        async with self.collection.watch(full_document="updateLookup") as stream:
+            # Read the current versions only once the stream is open, so no bump falls in between
+            for name, version in (await self.get_all()).items():
+                yield name, version
+            async for change in stream:
+                doc = change.get("fullDocument")
+                if doc:
+                    yield doc["_id"], doc["version"]
+
+
+class MongoStorage(Storage):
+
+    def __init__(self, db, status_check_retention_seconds: int = 0):
+        self.db = db
+        self.status_check_retention_seconds = status_check_retention_seconds
+        self.profile = MongoSingletonRepository(db.profile)
+        self.performance = MongoSingletonRepository(db.performance)
+        self.testimonials = MongoContentRepository(db.testimonials)
+        self.insights = MongoInsightRepository(db.insights)
+        self.contacts = MongoEventRepository(db.contacts, hidden=("notification",))
+        self.contact_notifications = MongoOutboxRepository(db.contacts, "notification")
+        self.status_checks = MongoEventRepository(db.status_checks)
+        self.contact_rollups = MongoRollupRepository(db.contact_rollups)
+        self.status_rollups = MongoRollupRepository(db.status_rollups)
+        self.nav = MongoNavRepository(db.nav_series, db.nav_stats)
+        self.versions = MongoVersionRepository(db.cache_versions)
+
+    async def prepare(self):
+        await self.ensure_indexes()
+        await self.migrate_string_timestamps()
+        await self.ensure_ttl_index(self.db.status_checks, "timestamp", self.status_check_retention_seconds)
+
+    async def ensure_ttl_index(self, collection, field: str, seconds: int):
+        """Expire documents seconds after their field date (0 = keep forever), adjusting an
+        existing TTL index in place when the configured retention changes"""
+        name = f"{field}_ttl"
+        existing = (await collection.index_information()).get(name)
+        if not seconds:
+            if existing:
+                await collection.drop_index(name)
+                logger.info("Dropped TTL index on %s.%s", collection.name, field)
+        elif existing is None:
+            await collection.create_index([(field, ASCENDING)], name=name, expireAfterSeconds=seconds)
+            logger.info("Created TTL index on %s.%s (%ds)", collection.name, field, seconds)
+        elif existing.get("expireAfterSeconds") != seconds:
+            await self.db.command("collMod", collection.name, index={"name": name, "expireAfterSeconds": seconds})
+            logger.info("Changed TTL on %s.%s to %ds", collection.name, field, seconds)
+
+    async def duplicate_singletons(self) -> Dict[str, List[dict]]:
+        """The documents of each profile/performance collection holding more than one, with
+        the one reads currently return first. Written before the singleton index existed,
+        they block that index until an operator picks one (cli.py dedupe-singletons)."""
+        duplicates = {}
+        for collection_name in SINGLETON_COLLECTIONS:
+            collection = self.db[collection_name]
+            docs = await collection.find({}).to_list(None)
+            if len(docs) > 1:
+                served = await collection.find_one({}, {"_id": 1})
+                docs.sort(key=lambda doc: doc["_id"] != served["_id"])
+                duplicates[collection_name] = docs
+        return duplicates
+
+    async def remove_duplicate_singletons(self, collection_name: str, keep) -> int:
+        """Delete every document of a singleton collection except the one with _id keep"""
+        result = await self.db[collection_name].delete_many({"_id": {"$ne": keep}})
+        return result.deleted_count
+
+    async def ensure_indexes(self):
+        """Create any missing indexes; a conflicting existing definition aborts startup"""
+        duplicates = await self.duplicate_singletons()
+        for collection_name, indexes in INDEXES.items():
+            collection = self.db[collection_name]
+            if collection_name in duplicates:
+                # Never pick a winner on boot; leave the collection as is until resolved
+                logger.error(
+                    "Not enforcing a single %s document: found %d (_ids %s); keep one with `python cli.py dedupe-singletons`",
+                    collection_name, len(duplicates[collection_name]),
+                    ", ".join(str(doc["_id"]) for doc in duplicates[collection_name]),
+                )
+                indexes = [index for index in indexes if index.document["name"] != "singleton_unique"]
+                if not indexes:
+                    continue
+            existing = set(await collection.index_information())
+            try:
+                await collection.create_indexes(indexes)
+            except OperationFailure as e:
+                logger.error("Index definition conflict on %s: %s", collection_name, e)
+                raise
+            created = [index.document["name"] for index in indexes if index.document["name"] not in existing]
+            if created:
+                logger.info("Created indexes on %s: %s", collection_name, ", ".join(created))
+
+    async def migrate_string_timestamps(self):
+        """Convert ISO-string timestamps left by older releases to native BSON dates; no-op once done"""
+        for collection_name in ("contacts", "status_checks"):
+            collection = self.db[collection_name]
+            operations, migrated = [], 0
+            cursor = collection.find({"timestamp": {"$type": "string"}}, {"_id": 1, "timestamp": 1})
+            async for doc in cursor.batch_size(TIMESTAMP_MIGRATION_BATCH_SIZE):
+                try:
+                    timestamp = datetime.fromisoformat(doc["timestamp"])
+                except ValueError:
+                    logger.warning("Skipping unparseable timestamp %r on %s", doc["timestamp"], collection_name)
+                    continue
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"timestamp": timestamp}}))
+                if len(operations) == TIMESTAMP_MIGRATION_BATCH_SIZE:
+                    await collection.bulk_write(operations, ordered=False)
+                    migrated += len(operations)
+                    operations = []
+            if operations:
+                await collection.bulk_write(operations, ordered=False)
+                migrated += len(operations)
+            if migrated:
+                logger.info("Migrated %d string timestamps on %s to BSON dates", migrated, collection_name)
+
+
+# ==================== IN-MEMORY BACKEND ====================
+
+def project(doc: dict, projection: Optional[dict]) -> dict:
+    """Copy of doc shaped by a Mongo-style inclusion or exclusion projection"""
+    fields = {k: v for k, v in (projection or {}).items() if k != "_id"}
+    if fields and not is_exclusion(fields):
+        return {k: copy.deepcopy(v) for k, v in doc.items() if k in fields}
+    return {k: copy.deepcopy(v) for k, v in doc.items() if fields.get(k, 1)}
+
+
+class MemorySingletonRepository(SingletonRepository):
+
+    def __init__(self):
+        self._doc: Optional[dict] = None
+
+    async def get(self, projection=None):
+        return None if self._doc is None else project(self._doc, projection)
+
+    async def get_or_create(self, default, projection=None):
+        if self._doc is None:
+            self._doc = copy.deepcopy(default)
+        return project(self._doc, projection)
+
+    async def set_fields(self, fields, default):
+        if self._doc is None:
+            self._doc = copy.deepcopy(default)
+        self._doc.update(copy.deepcopy(fields))
+        return project(self._doc, None)
+
+
+class MemoryContentRepository(ContentRepository):
+
+    def __init__(self):
+        # Keyed by id; dicts keep insertion order, which stands in for Mongo's natural order
+        self._docs: Dict[str, dict] = {}
+
+    async def list(self, filter, projection=None, limit=100):
+        matches = (doc for doc in self._docs.values() if all(doc.get(k) == v for k, v in filter.items()))
+        return [project(doc, projection) for _, doc in zip(range(limit), matches)]
+
+    async def get(self, doc_id, projection=None):
+        doc = self._docs.get(doc_id)
+        return None if doc is None else project(doc, projection)
+
+    async def count(self):
+        return len(self._docs)
+
+    async def existing_ids(self, ids):
+        return {doc_id for doc_id in ids if doc_id in self._docs}
+
+    async def insert(self, doc):
+        if doc["id"] in self._docs:
+            raise ValueError(f"Duplicate id {doc['id']}")
+        self._docs[doc["id"]] = copy.deepcopy(doc)
+
+    async def insert_many(self, docs):
+        errors = {}
+        for i, doc in enumerate(docs):
+            if doc["id"] in self._docs:
+                errors[i] = f"Duplicate id {doc['id']}"
+            else:
+                self._docs[doc["id"]] = copy.deepcopy(doc)
+        return errors
+
+    async def update(self, doc_id, fields):
+        doc = self._docs.get(doc_id)
+        if doc is None:
+            return None
+        doc.update(copy.deepcopy(fields))
+        return project(doc, None)
+
+    async def update_many(self, updates):
+        for doc_id, fields in updates:
+            await self.update(doc_id, fields)
+        return {}
+
+    async def delete(self, doc_id):
+        return self._docs.pop(doc_id, None) is not None
+
+    async def delete_many(self, ids):
+        for doc_id in ids:
+            self._docs.pop(doc_id, None)
+
+
+def text_terms(text: Optional[str]) -> Counter:
+    return Counter(re.findall(r"\w+", (text or "").lower()))
+
+
+class MemoryInsightRepository(MemoryContentRepository, InsightRepository):
+
+    def _published(self) -> List[dict]:
+        """Published insights, oldest first"""
+        return [doc for doc in self._docs.values() if doc.get("isPublished")]
+
+    async def search(self, q, category, limit, offset, projection):
+        terms = set(text_terms(q))
+        scored = []
+        for position, doc in enumerate(self._published()):
+            score = sum(
+                weight * sum(counts[t] for t in terms)
+                for field, weight in INSIGHT_TEXT_WEIGHTS.items()
+                for counts in (text_terms(doc.get(field)),)
+            )
+            if score:
+                scored.append((score, position, doc))
+        # Highest score first, newest first among equal scores
+        matches = [doc for _, _, doc in sorted(scored, key=lambda s: (s[0], s[1]), reverse=True)]
+        categories = category_facets(matches)
+        if category:
+            matches = [doc for doc in matches if doc.get("category") == category]
+        items = [project(doc, projection) for doc in matches[offset:offset + limit]]
+        return items, len(matches), categories
+
+    async def browse(self, categories, limit, offset, projection):
+        wanted = set(categories)
+        matches = [doc for doc in reversed(self._published()) if doc.get("category") in wanted]
+        return [project(doc, projection) for doc in matches[offset:offset + limit]]
+
+    async def category_counts(self):
+        return category_facets(self._published())
+
+
+def category_facets(docs: List[dict]) -> List[dict]:
+    counts = Counter(doc.get("category") for doc in docs)
+    return [{"category": name, "count": n} for name, n in sorted(counts.items(), key=lambda c: (-c[1], c[0]))]
+
+
+class MemoryEventRepository(EventRepository):
+
+    def __init__(self, retention_seconds: int = 0, hidden: Tuple[str, ...] = ()):
+        # Parallel lists kept sorted by (timestamp, id) so range and keyset reads are bisections
+        self._keys: List[EventKey] = []
+        self._docs: List[dict] = []
+        self.retention_seconds = retention_seconds
+        self.default_projection = {field: 0 for field in hidden}
+
+    async def insert(self, doc):
+        key = (doc["timestamp"], doc["id"])
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._docs.insert(position, copy.deepcopy(doc))
+        if self.retention_seconds:
+            # Stand-in for a TTL index: drop everything older than the retention window
+            cutoff = bisect_left(self._keys, (datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds),))
+            del self._keys[:cutoff], self._docs[:cutoff]
+
+    async def insert_many(self, docs):
+        for doc in docs:
+            await self.insert(doc)
+        return {}
+
+    def _bounds(self, since, until, after) -> Tuple[int, int]:
+        low = bisect_left(self._keys, (since,)) if since is not None else 0
+        high = bisect_left(self._keys, (until,)) if until is not None else len(self._keys)
+        if after is not None:
+            high = min(high, bisect_left(self._keys, after))
+        return low, high
+
+    async def page(self, since, until, after, limit, projection=None):
+        low, high = self._bounds(since, until, after)
+        projection = projection or self.default_projection
+        return [project(doc, projection) for doc in reversed(self._docs[max(low, high - limit):high])]
+
+    async def stream(self, since, until, after, projection=None, batch_size=500):
+        low, high = self._bounds(since, until, after)
+        projection = projection or self.default_projection
+        for n, position in enumerate(range(high - 1, low - 1, -1), 1):
+            yield project(self._docs[position], projection)
+            if n % batch_size == 0:
+                await asyncio.sleep(0)
+
+
+class MemoryOutboxRepository(OutboxRepository):
+
+    def __init__(self, events: MemoryEventRepository, field: str):
+        self.events = events
+        self.field = field
+
+    def _states(self):
+        return (doc[self.field] for doc in self.events._docs if self.field in doc)
+
+    def _state(self, doc_id: str) -> Optional[dict]:
+        return next((doc[self.field] for doc in self.events._docs if doc["id"] == doc_id and self.field in doc), None)
+
+    async def claim(self, now, lease_until, limit):
+        due = [
+            doc for doc in self.events._docs
+            if self.field in doc and doc[self.field]["state"] == "pending" and doc[self.field]["nextAttemptAt"] <= now
+        ]
+        due.sort(key=lambda doc: doc[self.field]["nextAttemptAt"])
+        for doc in due[:limit]:
+            doc[self.field]["nextAttemptAt"] = lease_until
+            doc[self.field]["attempts"] += 1
+        return [project(doc, None) for doc in due[:limit]]
+
+    async def _set(self, doc_id: str, fields: dict, unset: Tuple[str, ...]) -> None:
+        state = self._state(doc_id)
+        if state is not None:
+            state.update(fields)
+            for key in unset:
+                state.pop(key, None)
+
+    async def complete(self, doc_id, at):
+        await self._set(doc_id, {"state": "sent", "sentAt": at}, ("nextAttemptAt", "lastError"))
+
+    async def retry(self, doc_id, next_attempt_at, error):
+        await self._set(doc_id, {"nextAttemptAt": next_attempt_at, "lastError": error}, ())
+
+    async def dead_letter(self, doc_id, at, error):
+        await self._set(doc_id, {"state": "dead", "deadAt": at, "lastError": error}, ("nextAttemptAt",))
+
+    async def requeue_dead(self, now):
+        dead = [state for state in self._states() if state["state"] == "dead"]
+        for state in dead:
+            state.update(state="pending", attempts=0, nextAttemptAt=now)
+            state.pop("deadAt", None)
+        return len(dead)
+
+    async def counts(self):
+        return dict(Counter(state["state"] for state in self._states()))
+
+
+class MemoryRollupRepository(RollupRepository):
+
+    def __init__(self):
+        self._counters: Dict[tuple, dict] = {}
+
+    async def increment(self, updates):
+        now = datetime.now(timezone.utc)
+        for key, count, expires_at in updates:
+            counter = self._counters.setdefault(tuple(sorted(key.items())), {**key, "count": 0, "expiresAt": expires_at})
+            counter["count"] += count
+        # Stand-in for the TTL index on expiresAt
+        for counter_key in [k for k, c in self._counters.items() if c["expiresAt"] is not None and c["expiresAt"] <= now]:
+            del self._counters[counter_key]
+
+    async def find(self, granularity, since, until, match=None):
+        found = [
+            {k: v for k, v in counter.items() if k != "expiresAt"}
+            for counter in self._counters.values()
+            if counter["granularity"] == granularity and since <= counter["bucket"] < until
+            and all(counter.get(k) == v for k, v in (match or {}).items())
+        ]
+        return sorted(found, key=lambda counter: counter["bucket"])
+
+    async def rebuild(self, source, dimension, granularities, known, missing, other):
+        counters: Dict[tuple, dict] = {}
+        async for doc in source.stream(None, None, None, {"timestamp": 1, dimension: 1}):
+            value = rollup_value(doc.get(dimension), known, missing, other)
+            for granularity in granularities:
+                key = {"granularity": granularity, "bucket": bucket_start(doc["timestamp"], granularity),
+                       dimension: value}
+                counter = counters.setdefault(tuple(sorted(key.items())), {**key, "count": 0, "expiresAt": None})
+                counter["count"] += 1
+        self._counters = counters
+        return len(counters)
+
+
+class MemoryNavRepository(NavRepository):
+
+    def __init__(self):
+        self._buckets: Dict[int, dict] = {}
+        self._stats: Optional[dict] = None
+
+    async def get_buckets(self, years=None, from_year=None):
+        selected = sorted(
+            year for year in self._buckets
+            if (years is None or year in years) and (from_year is None or year >= from_year)
+        )
+        return [dict(self._buckets[year]) for year in selected]
+
+    async def save_buckets(self, buckets):
+        for bucket in buckets:
+            self._buckets[bucket["_id"]] = dict(bucket)
+
+    async def get_stats(self):
+        return None if self._stats is None else dict(self._stats)
+
+    async def save_stats(self, stats):
+        self._stats = dict(stats)
+
+
+class MemoryVersionRepository(VersionRepository):
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+
+    async def bump(self, name):
+        self._versions[name] = self._versions.get(name, 0) + 1
+        return self._versions[name]
+
+    async def get_all(self):
+        return dict(self._versions)
+
+
+class MemoryStorage(Storage):
+    """Process-local storage for tests and benchmarks; nothing survives a restart"""
+
+    def __init__(self, status_check_retention_seconds: int = 0):
+        self.profile = MemorySingletonRepository()
+        self.performance = MemorySingletonRepository()
+        self.testimonials = MemoryContentRepository()
+        self.insights = MemoryInsightRepository()
+        self.contacts = MemoryEventRepository(hidden=("notification",))
+        self.contact_notifications = MemoryOutboxRepository(self.contacts, "notification")
+        self.status_checks = MemoryEventRepository(status_check_retention_seconds)
+        self.contact_rollups = MemoryRollupRepository()
+        self.status_rollups = MemoryRollupRepository()
+        self.nav = MemoryNavRepository()
+        self.versions = MemoryVersionRepository()
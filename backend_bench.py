@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Local load test and benchmark for the Juniper Broz backend API.
+
+Boots backend/server.py's app in-process (ASGI transport, no sockets) against the
+in-memory storage backend or a real Mongo server given with --mongo-url, drives
+concurrent requests at each endpoint and reports p50/p95/p99 latency and requests
+per second. Results are written as JSON so runs from different commits can be diffed:
+
+    python backend_bench.py --output bench_before.json
+    python backend_bench.py --output bench_after.json --compare bench_before.json
+
+With the default memory backend every storage call is served from process memory, so the
+numbers measure the API's own overhead (routing, validation, serialization, caching).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent
+BACKEND_DIR = ROOT_DIR / "backend"
+BENCH_DB_NAME = "bench_database"
+COLLECTIONS = ("profile", "performance", "testimonials", "insights", "contacts", "status_checks")
+
+_contact_ids = itertools.count()
+
+
+def contact_body():
+    n = next(_contact_ids)
+    return {
+        "name": f"Bench Lead {n}",
+        "email": f"lead{n}@example.com",
+        "phone": "+15550100",
+        "investmentGoal": "growth",
+        "message": "Interested in a consultation.",
+    }
+
+
+# (name, method, path, request body factory)
+SCENARIOS = [
+    ("seed", "POST", "/api/seed", None),
+    ("profile", "GET", "/api/profile", None),
+    ("performance", "GET", "/api/performance", None),
+    ("testimonials", "GET", "/api/testimonials", None),
+    ("insights", "GET", "/api/insights", None),
+    ("site", "GET", "/api/site", None),
+    ("contacts_post", "POST", "/api/contacts", contact_body),
+]
+
+
+def load_server(mongo_url):
+    os.environ["STORAGE_BACKEND"] = "mongo" if mongo_url else "memory"
+    os.environ["MONGO_URL"] = mongo_url or "mongodb://localhost:27017"
+    os.environ["DB_NAME"] = BENCH_DB_NAME
+    # Keep per-request log lines out of the results table and their cost out of the numbers
+    os.environ["ACCESS_LOG_ENABLED"] = "false"
+    os.environ["SLOW_REQUEST_MS"] = "0"
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+
+    # httpx logs every request at INFO, which the server's root logging would print
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return server
+
+
+async def run_scenario(client, method, path, body_factory, total, concurrency):
+    latencies = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(remaining) < total:
+            json_body = body_factory() if body_factory else None
+            started = time.perf_counter()
+            response = await client.request(method, path, json=json_body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+async def run_benchmark(server, args):
+    results = {}
+    async with server.app.router.lifespan_context(server.app):
+        if args.mongo_url:
+            # Start every run from the same empty (but indexed) collections
+            for name in COLLECTIONS:
+                await server.storage.db[name].delete_many({})
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/api/seed")
+            for name, method, path, body_factory in SCENARIOS:
+                if args.only and name not in args.only:
+                    continue
+                await run_scenario(client, method, path, body_factory, args.warmup, args.concurrency)
+                results[name] = await run_scenario(client, method, path, body_factory, args.requests, args.concurrency)
+                print_row(name, results[name])
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_header():
+    print(f"{'scenario':<15} {'requests':>8} {'errors':>6} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+
+
+def print_row(name, r):
+    print(f"{name:<15} {r['requests']:>8} {r['errors']:>6} {r['rps']:>9.1f} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} {r['p99_ms']:>8.3f}")
+
+
+def compare(baseline, current, threshold):
+    """Print per-scenario changes against a baseline; return the regressions beyond threshold (%)"""
+    regressions = []
+    print(f"\n{'scenario':<15} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}   (change vs baseline)")
+    for name, r in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        changes = {
+            "rps": (r["rps"] / base["rps"] - 1) * 100,
+            "p50_ms": (r["p50_ms"] / base["p50_ms"] - 1) * 100,
+            "p95_ms": (r["p95_ms"] / base["p95_ms"] - 1) * 100,
+            "p99_ms": (r["p99_ms"] / base["p99_ms"] - 1) * 100,
+        }
+        print(f"{name:<15} " + " ".join(f"{v:>+8.1f}%" for v in changes.values()))
+        if changes["rps"] < -threshold or changes["p95_ms"] > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=100, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--only", nargs="*", help="scenario names to run (default: all)")
+    parser.add_argument("--mongo-url", help="benchmark against a real Mongo server (database %s is emptied)" % BENCH_DB_NAME)
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent for --compare")
+    args = parser.parse_args()
+
+    server = load_server(args.mongo_url)
+    print_header()
+    results = asyncio.run(run_benchmark(server, args))
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "storage": "mongo" if args.mongo_url else "memory",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
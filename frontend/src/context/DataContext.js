@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useState, useEffect, useCallback } from 'react';
-import { getProfile, getTestimonials, getInsights, getPerformance, seedDatabase } from '../services/api';
+import { getSite, seedDatabase } from '../services/api';
 
 // Default mock data as fallback
 import { profileData as mockProfile, testimonials as mockTestimonials, insights as mockInsights, performanceData as mockPerformance } from '../data/mockData';
@@ -30,13 +30,12 @@ export const DataProvider = ({ children }) => {
       // First seed the database to ensure we have data
       await seedDatabase();
       
-      // Fetch all data in parallel
-      const [profileRes, testimonialsRes, insightsRes, performanceRes] = await Promise.all([
-        getProfile().catch(() => null),
-        getTestimonials().catch(() => null),
-        getInsights().catch(() => null),
-        getPerformance().catch(() => null)
-      ]);
+      // Fetch all page content in a single request
+      const site = await getSite().catch(() => null);
+      const profileRes = site?.profile;
+      const testimonialsRes = site?.testimonials;
+      const insightsRes = site?.insights;
+      const performanceRes = site?.performance;
       
       if (profileRes) setProfile(profileRes);
       if (testimonialsRes && testimonialsRes.length > 0) setTestimonials(testimonialsRes);
@@ -3,6 +3,12 @@ import axios from 'axios';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Site bootstrap API (profile, performance, testimonials and insights in one request)
+export const getSite = async () => {
+  const response = await axios.get(`${API}/site`);
+  return response.data;
+};
+
 // Profile API
 export const getProfile = async () => {
   const response = await axios.get(`${API}/profile`);
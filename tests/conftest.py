@@ -0,0 +1,50 @@
+"""
+Shared fixtures: the backend app served in-process against the in-memory storage backend.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+import pytest
+
+# A real server for the Mongo storage contract tests (skipped when unset)
+MONGO_TEST_URL = os.environ.get("MONGO_URL")
+
+# Configure before server is imported: its settings are read at import time
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+os.environ["ACCESS_LOG_ENABLED"] = "false"
+os.environ["SLOW_REQUEST_MS"] = "0"
+os.environ["WRITE_BEHIND_ENABLED"] = "false"
+os.environ["SNAPSHOT_DIR"] = ""
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@asynccontextmanager
+async def app_client():
+    """HTTP client for the app, started with a fresh, empty in-memory storage"""
+    server.response_cache.invalidate_prefix("")
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            yield http
+
+
+@pytest.fixture
+async def client():
+    async with app_client() as http:
+        yield http
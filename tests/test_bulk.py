@@ -0,0 +1,69 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def new_testimonial(**overrides):
+    return {"name": "Ada", "role": "Investor", "content": "Great returns.", "rating": 5, **overrides}
+
+
+async def test_bulk_create_reports_each_item(client):
+    response = await client.post("/api/testimonials/bulk", json=[new_testimonial(), new_testimonial(rating=6), "nonsense"])
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["succeeded"], result["failed"]) == (1, 2)
+    assert [r["status"] for r in result["results"]] == ["created", "error", "error"]
+    assert [r["index"] for r in result["results"]] == [0, 1, 2]
+    assert "rating" in result["results"][1]["error"]
+    assert len((await client.get("/api/testimonials/all")).json()) == 1
+
+
+async def test_bulk_update_distinguishes_outcomes(client):
+    created = (await client.post("/api/testimonials/bulk", json=[new_testimonial(), new_testimonial(name="Bo")])).json()
+    first, second = (r["id"] for r in created["results"])
+
+    result = (await client.patch("/api/testimonials/bulk", json=[
+        {"id": first, "changes": {"rating": 4}},
+        {"id": second, "changes": {}},
+        {"id": "missing", "changes": {"rating": 3}},
+        {"id": first, "changes": {"rating": 9}},
+    ])).json()
+    assert [r["status"] for r in result["results"]] == ["updated", "unchanged", "not_found", "error"]
+    assert (result["succeeded"], result["unchanged"], result["failed"]) == (1, 1, 2)
+    ratings = {t["id"]: t["rating"] for t in (await client.get("/api/testimonials/all")).json()}
+    assert ratings == {first: 4, second: 5}
+
+
+async def test_bulk_delete_reports_missing_ids(client):
+    created = (await client.post("/api/insights/bulk", json=[
+        {"title": "A", "excerpt": "a", "category": "Strategy"},
+        {"title": "B", "excerpt": "b", "category": "Strategy"},
+    ])).json()
+    ids = [r["id"] for r in created["results"]]
+
+    result = (await client.request("DELETE", "/api/insights/bulk", json={"ids": [ids[0], "missing"]})).json()
+    assert [r["status"] for r in result["results"]] == ["deleted", "not_found"]
+    assert [i["id"] for i in (await client.get("/api/insights/all")).json()] == [ids[1]]
+
+
+async def test_bulk_without_successes_leaves_caches_alone(client):
+    before = await server.storage.versions.get_all()
+    result = (await client.patch("/api/testimonials/bulk", json=[{"id": "missing", "changes": {"rating": 3}}])).json()
+    assert result["succeeded"] == 0
+    assert await server.storage.versions.get_all() == before
+
+
+def test_bulk_bodies_are_documented():
+    paths = server.app.openapi()["paths"]
+
+    def item_schema(path, method):
+        return paths[path][method]["requestBody"]["content"]["application/json"]["schema"]["items"]
+
+    assert item_schema("/api/testimonials/bulk", "post")["required"] == ["name", "role", "content", "rating"]
+    assert item_schema("/api/testimonials/bulk", "patch")["properties"]["changes"] == {
+        "$ref": "#/components/schemas/TestimonialUpdate"
+    }
+    assert item_schema("/api/insights/bulk", "post")["title"] == "InsightCreate"
+    assert item_schema("/api/insights/bulk", "patch")["title"] == "InsightPatch"
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import server
+from tests.test_nav import nav_series
+
+pytestmark = pytest.mark.anyio
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    days, nav = nav_series()
+    benchmark = nav[::-1].copy()
+    nav[431] *= 3  # a spike LTTB must not smooth away
+
+    keep = server.lttb_indices(days.astype(np.float64), np.vstack((nav, benchmark)), 100)
+    assert keep.size == 100
+    assert (keep[0], keep[-1]) == (0, days.size - 1)
+    assert np.all(np.diff(keep) > 0)
+    assert 431 in keep
+
+
+def test_lttb_returns_every_point_when_not_downsampling():
+    x = np.arange(10, dtype=np.float64)
+    ys = np.vstack((x, x))
+    assert server.lttb_indices(x, ys, 10).tolist() == list(range(10))
+    assert server.lttb_indices(x, ys, 2).tolist() == list(range(10))
+
+
+def test_chart_points_round_up_to_a_tier():
+    assert server.chart_points(None) == server.DEFAULT_CHART_POINTS
+    assert server.chart_points(3) == server.CHART_POINT_TIERS[0]
+    assert server.chart_points(251) == 500
+    assert server.chart_points(server.MAX_CHART_POINTS) == server.MAX_CHART_POINTS
+
+
+async def test_ingested_nav_drives_the_chart(client):
+    days, nav = nav_series(start="2023-01-01", end="2024-01-01")
+    points = [
+        {"date": str(day), "portfolio": p, "benchmark": p * 0.9}
+        for day, p in zip(days.astype("datetime64[D]"), nav)
+    ]
+    first = (await client.post("/api/performance/nav", json=points[:300])).json()
+    second = (await client.post("/api/performance/nav", json=points[300:])).json()
+    assert (first["incremental"], second["incremental"]) == (False, True)
+    assert second["totalPoints"] == days.size
+
+    chart = (await client.get("/api/performance", params={"range": "ALL", "points": 40})).json()["chartData"]
+    assert len(chart) == 50
+    assert (chart[0]["month"], chart[-1]["month"]) == ("2023-01-01", "2023-12-31")
+    assert chart[0]["portfolio"] == 100.0
+    assert chart[-1]["portfolio"] == round(nav[-1] / nav[0] * 100, 2)
+
+
+async def test_default_reads_switch_to_the_nav_chart(client):
+    stored = (await client.get("/api/performance")).json()
+    assert stored["chartData"][0]["month"] == "Jan"
+
+    days, nav = nav_series(start="2023-01-01", end="2024-01-01")
+    await client.post("/api/performance/nav", json=[
+        {"date": str(day), "portfolio": p, "benchmark": p} for day, p in zip(days.astype("datetime64[D]"), nav)
+    ])
+
+    performance = (await client.get("/api/performance")).json()
+    site = (await client.get("/api/site")).json()["performance"]
+    projected = (await client.get("/api/performance", params={"fields": "chartData"})).json()
+    assert len(performance["chartData"]) == server.DEFAULT_CHART_POINTS
+    assert performance["chartData"][0]["month"] == "2023-01-01"
+    assert site["chartData"] == performance["chartData"] == projected["chartData"]
+    assert site["summary"] == performance["summary"] != stored["summary"]
+
+    # A later edit to other fields keeps the NAV chart
+    await client.put("/api/performance", json={"disclaimer": "Past performance is no guarantee."})
+    assert (await client.get("/api/performance")).json()["chartData"] == performance["chartData"]
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def contact(goal=None):
+    return {"name": "Lead", "email": "lead@example.com", **({"investmentGoal": goal} if goal is not None else {})}
+
+
+async def test_contact_stats_break_down_goals(client):
+    for goal in ("forex-trading", "forex-trading", "wealth-planning", None):
+        assert (await client.post("/api/contacts", json=contact(goal))).status_code == 200
+
+    stats = (await client.get("/api/contacts/stats")).json()
+    assert stats["total"] == 4
+    assert stats["goals"] == {"forex-trading": 2, "wealth-planning": 1, "unspecified": 1}
+    assert [bucket["count"] for bucket in stats["buckets"]] == [4]
+
+    weekly = (await client.get("/api/contacts/stats", params={"granularity": "week", "investmentGoal": "forex-trading"})).json()
+    assert (weekly["total"], weekly["goals"]) == (2, {"forex-trading": 2})
+
+
+# The contact form sends "" when nothing is picked; the field itself is free text
+GOALS = ("", "   ", None, " Forex-Trading ", "x" * 5000, "<script>", "wealth-planning")
+EXPECTED_GOALS = {"unspecified": 3, "forex-trading": 1, "other": 2, "wealth-planning": 1}
+
+
+async def test_goal_counters_stay_bounded(client):
+    for goal in GOALS:
+        await client.post("/api/contacts", json=contact(goal))
+    assert (await client.get("/api/contacts/stats")).json()["goals"] == EXPECTED_GOALS
+
+
+async def test_rebuild_recomputes_contact_rollups(client):
+    for goal in GOALS:
+        await client.post("/api/contacts", json=contact(goal))
+    expected = (await client.get("/api/contacts/stats", params={"granularity": "week"})).json()
+    assert expected["goals"] == EXPECTED_GOALS
+
+    # Counters lost or skewed (e.g. restored from an older backup) are recomputed from the raw contacts
+    this_week = server.bucket_start(datetime.now(timezone.utc), "week")
+    await server.storage.contact_rollups.increment([
+        ({"granularity": "week", "bucket": this_week, "investmentGoal": "wealth-planning"}, 5, None),
+    ])
+    assert await server.rebuild_contact_rollups() == 2 * len(EXPECTED_GOALS)
+    rebuilt = (await client.get("/api/contacts/stats", params={"granularity": "week"})).json()
+    assert rebuilt["buckets"] == expected["buckets"]
@@ -0,0 +1,21 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cached_read_revalidates_with_etag(client):
+    first = await client.get("/api/profile")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    unchanged = await client.get("/api/profile", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert (await client.get("/api/profile", headers={"If-None-Match": f'W/{etag}, "other"'})).status_code == 304
+
+    await client.put("/api/profile", json={"name": "Renamed"})
+    changed = await client.get("/api/profile", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "Renamed"
+    assert changed.headers["etag"] != etag
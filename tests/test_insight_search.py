@@ -0,0 +1,56 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+INSIGHTS = [
+    {"title": "Hedging currency risk", "excerpt": "Forex basics", "content": "Options and forwards.", "category": "Forex"},
+    {"title": "Options income", "excerpt": "Covered calls", "content": "Selling options for yield.", "category": "Options"},
+    {"title": "Rebalancing", "excerpt": "Keep the mix", "content": "Trim winners, add to laggards.", "category": "Strategy"},
+    {"title": "Carry trades", "excerpt": "Forex yield", "content": "Borrow low, lend high.", "category": "Forex"},
+]
+
+
+@pytest.fixture
+async def insight_ids(client):
+    created = (await client.post("/api/insights/bulk", json=INSIGHTS)).json()
+    return [r["id"] for r in created["results"]]
+
+
+async def test_text_search_ranks_and_facets_the_matches(client, insight_ids):
+    result = (await client.get("/api/insights/search", params={"q": "options"})).json()
+    # A title match outweighs a body match
+    assert [item["id"] for item in result["items"]] == [insight_ids[1], insight_ids[0]]
+    assert result["total"] == 2
+    assert result["categories"] == [{"category": "Forex", "count": 1}, {"category": "Options", "count": 1}]
+
+    in_category = (await client.get("/api/insights/search", params={"q": "options", "category": "Forex"})).json()
+    assert ([item["id"] for item in in_category["items"]], in_category["total"]) == ([insight_ids[0]], 1)
+    assert in_category["categories"] == result["categories"]
+
+
+async def test_browsing_pages_newest_first(client, insight_ids):
+    result = (await client.get("/api/insights/search", params={"limit": 3})).json()
+    assert [item["id"] for item in result["items"]] == insight_ids[::-1][:3]
+    assert result["total"] == 4
+    assert result["categories"] == [
+        {"category": "Forex", "count": 2}, {"category": "Options", "count": 1}, {"category": "Strategy", "count": 1},
+    ]
+    assert "content" not in result["items"][0]
+
+    forex = (await client.get("/api/insights/search", params={"category": "Forex", "offset": 1})).json()
+    assert ([item["id"] for item in forex["items"]], forex["total"]) == ([insight_ids[0]], 2)
+
+
+async def test_browse_counts_are_cached_until_insights_change(client, insight_ids):
+    await client.get("/api/insights/search")
+    misses = server.response_cache.stats()["misses"]
+    await client.get("/api/insights/search", params={"category": "Options"})
+    assert server.response_cache.stats()["misses"] == misses
+
+    await client.put(f"/api/insights/{insight_ids[2]}", json={"isPublished": False})
+    result = (await client.get("/api/insights/search")).json()
+    assert result["total"] == 3
+    assert {c["category"] for c in result["categories"]} == {"Forex", "Options"}
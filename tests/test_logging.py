@@ -0,0 +1,42 @@
+import json
+import logging
+from queue import SimpleQueue
+
+import server
+
+
+def queued_record(log):
+    records = SimpleQueue()
+    logger = logging.getLogger("tests.logging")
+    logger.propagate = False
+    handler = server.LocalQueueHandler(records)
+    logger.addHandler(handler)
+    try:
+        log(logger)
+    finally:
+        logger.removeHandler(handler)
+    return records.get_nowait()
+
+
+def test_exception_is_formatted_on_the_listener():
+    def log(logger):
+        try:
+            raise ValueError("bad input")
+        except ValueError:
+            logger.exception("boom %s", 42, extra={"route": "/api/profile"})
+
+    record = queued_record(log)
+    # Nothing was rendered on the logging thread
+    assert record.exc_info is not None and record.exc_text is None
+
+    entry = json.loads(server.JsonFormatter().format(record))
+    assert (entry["message"], entry["route"], entry["level"]) == ("boom 42", "/api/profile", "ERROR")
+    assert entry["exception"].startswith("Traceback")
+    assert entry["exception"].endswith("ValueError: bad input")
+
+
+def test_message_args_are_fixed_when_queued():
+    values = ["before"]
+    record = queued_record(lambda logger: logger.warning("value %s", values))
+    values.append("after")
+    assert json.loads(server.JsonFormatter().format(record))["message"] == "value ['before']"
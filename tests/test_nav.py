@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import server
+
+
+def nav_series(start="2021-06-01", end="2024-03-01", seed=7):
+    """Daily days-since-epoch and a positive random-walk NAV"""
+    days = np.arange(np.datetime64(start), np.datetime64(end)).astype(np.int64)
+    rng = np.random.default_rng(seed)
+    nav = 100 * np.cumprod(1 + rng.normal(0.0004, 0.01, days.size))
+    return days, nav
+
+
+def test_incremental_stats_match_full_recompute():
+    days, nav = nav_series()
+    full = server.accumulate_nav_stats(None, days, nav)
+
+    # Chunks straddle year boundaries and include a single-point append
+    cuts = [0, 200, 201, 580, 940, days.size]
+    state = None
+    for start, end in zip(cuts, cuts[1:]):
+        state = server.accumulate_nav_stats(state, days[start:end], nav[start:end])
+
+    assert state.keys() == full.keys()
+    for key in ("firstDay", "count", "year", "lastDay"):
+        assert state[key] == full[key]
+    for key in ("firstNav", "mean", "m2", "peak", "maxDrawdown", "yearStartNav", "lastNav"):
+        assert state[key] == pytest.approx(full[key], rel=1e-9, abs=1e-15)
+
+
+def test_stats_match_numpy():
+    days, nav = nav_series()
+    state = server.accumulate_nav_stats(None, days, nav)
+    returns = nav[1:] / nav[:-1] - 1
+
+    assert state["count"] == returns.size
+    assert state["mean"] == pytest.approx(returns.mean())
+    assert state["m2"] == pytest.approx(returns.var() * returns.size)
+    assert state["maxDrawdown"] == pytest.approx((nav / np.maximum.accumulate(nav) - 1).min())
+    # YTD runs from the last NAV of 2023
+    years = days.astype("datetime64[D]").astype("datetime64[Y]").astype(int) + 1970
+    assert (state["year"], state["yearStartNav"]) == (2024, pytest.approx(nav[years == 2023][-1]))
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+import server
+from tests.conftest import app_client
+
+pytestmark = pytest.mark.anyio
+
+
+class StubSMTPServer:
+    """Just enough of an SMTP server for smtplib: accepts or rejects each message's DATA"""
+
+    def __init__(self):
+        self.messages = []
+        self.reject = 0  # number of upcoming messages to refuse with a temporary error
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _session(self, reader, writer):
+        writer.write(b"220 stub ready\r\n")
+        while line := await reader.readline():
+            command = line[:4].upper()
+            if command == b"DATA":
+                writer.write(b"354 end with .\r\n")
+                await writer.drain()
+                lines = []
+                while (data := await reader.readline()) not in (b".\r\n", b""):
+                    lines.append(data)
+                if self.reject:
+                    self.reject -= 1
+                    writer.write(b"451 try again later\r\n")
+                else:
+                    self.messages.append(b"".join(lines).decode())
+                    writer.write(b"250 queued\r\n")
+            elif command == b"QUIT":
+                writer.write(b"221 bye\r\n")
+                break
+            else:
+                writer.write(b"250 ok\r\n")
+            await writer.drain()
+        await writer.drain()
+        writer.close()
+
+
+@pytest.fixture
+async def smtp(monkeypatch):
+    stub = StubSMTPServer()
+    monkeypatch.setattr(server, "NOTIFY_SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(server, "NOTIFY_SMTP_PORT", await stub.start())
+    yield stub
+    await stub.stop()
+
+
+@pytest.fixture
+async def client(smtp, monkeypatch):
+    monkeypatch.setattr(server, "NOTIFICATIONS_ENABLED", True)
+    monkeypatch.setattr(server, "NOTIFY_BACKOFF_BASE_SECONDS", 0.01)
+    worker = server.NotificationWorker(True, batch_size=10, concurrency=2, max_attempts=3, poll_interval=0.02)
+    monkeypatch.setattr(server, "notification_worker", worker)
+    async with app_client() as http:
+        yield http
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.02)
+
+
+async def notification_states(client):
+    return (await client.get("/api/notifications/stats")).json()["states"]
+
+
+def contact(name):
+    return {"name": name, "email": f"{name.split()[0].lower()}@example.com", "investmentGoal": "growth"}
+
+
+async def test_new_contacts_are_emailed_once(client, smtp):
+    for name in ("Alice", "Bob", "Carol"):
+        assert (await client.post("/api/contacts", json=contact(name))).status_code == 200
+
+    async def delivered():
+        return await notification_states(client) == {"sent": 3}
+
+    await wait_for(delivered)
+    assert sorted(m.split("Subject: ")[1].splitlines()[0] for m in smtp.messages) == [
+        f"New consultation request from {name}" for name in ("Alice", "Bob", "Carol")
+    ]
+    # The outbox entry is internal to storage
+    assert all("notification" not in item for item in (await client.get("/api/contacts")).json()["items"])
+
+
+async def test_failed_send_is_retried(client, smtp):
+    smtp.reject = 2
+    await client.post("/api/contacts", json=contact("Alice"))
+
+    async def delivered():
+        return await notification_states(client) == {"sent": 1}
+
+    await wait_for(delivered)
+    stats = (await client.get("/api/notifications/stats")).json()
+    assert (stats["retried"], stats["sent"], stats["deadLettered"]) == (2, 1, 0)
+    assert len(smtp.messages) == 1
+
+
+async def test_exhausted_retries_dead_letter_until_requeued(client, smtp):
+    smtp.reject = 3
+    await client.post("/api/contacts", json=contact("Alice"))
+
+    async def dead():
+        return await notification_states(client) == {"dead": 1}
+
+    await wait_for(dead)
+    assert smtp.messages == []
+
+    assert await server.storage.contact_notifications.requeue_dead(server.datetime.now(server.timezone.utc)) == 1
+    server.notification_worker.wake()
+
+    async def delivered():
+        return await notification_states(client) == {"sent": 1}
+
+    await wait_for(delivered)
+    assert len(smtp.messages) == 1
+
+
+async def test_bad_contact_does_not_fail_its_batch(client, smtp):
+    for name in ("Alice", "Bob\nBcc: victim@example.com", "Carol"):
+        await client.post("/api/contacts", json=contact(name))
+
+    async def delivered():
+        return await notification_states(client) == {"sent": 3}
+
+    await wait_for(delivered)
+    assert len(smtp.messages) == 3
+    headers = [message.split("\r\n\r\n", 1)[0] for message in smtp.messages]
+    assert not any(line.startswith("Bcc:") for block in headers for line in block.splitlines())
+    assert "Subject: New consultation request from Bob Bcc: victim@example.com" in "".join(headers)
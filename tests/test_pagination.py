@@ -0,0 +1,56 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+# Recent enough to be inside the status check retention window
+BASE = (datetime.now(timezone.utc) - timedelta(hours=1)).replace(microsecond=0)
+
+
+async def insert_status_checks(count):
+    # Pairs share a timestamp, so the id tie-break decides their order
+    docs = [
+        server.StatusCheck(client_name=f"c{i}", timestamp=BASE + timedelta(seconds=i // 2)).model_dump()
+        for i in range(count)
+    ]
+    await server.storage.status_checks.insert_many(docs)
+    return sorted(docs, key=lambda doc: (doc["timestamp"], doc["id"]), reverse=True)
+
+
+async def test_keyset_pages_cover_every_document_once(client):
+    expected = await insert_status_checks(25)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, **({"after": cursor} if cursor else {})}
+        page = (await client.get("/api/status", params=params)).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [doc["id"] for doc in expected]
+
+
+async def test_keyset_page_respects_time_window(client):
+    expected = await insert_status_checks(10)
+    since, until = BASE + timedelta(seconds=1), BASE + timedelta(seconds=4)
+    page = (await client.get("/api/status", params={"since": since.isoformat(), "until": until.isoformat()})).json()
+    assert [item["id"] for item in page["items"]] == [doc["id"] for doc in expected if since <= doc["timestamp"] < until]
+    assert page["next_cursor"] is None
+
+
+async def test_invalid_cursor_is_rejected(client):
+    assert (await client.get("/api/status", params={"after": "not-a-cursor"})).status_code == 400
+
+
+async def test_ndjson_streams_every_document(client):
+    expected = await insert_status_checks(12)
+    response = await client.get("/api/status", headers={"Accept": server.NDJSON_MEDIA_TYPE})
+    assert response.headers["content-type"].startswith(server.NDJSON_MEDIA_TYPE)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [doc["id"] for doc in expected]
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = server.ResponseCache(ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b'{"n":1}'
+
+    results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(20)))
+    assert calls == 1
+    assert {result.body for result in results} == {b'{"n":1}'}
+    assert cache.stats()["collapsed"] == 19
+
+
+async def test_load_invalidated_midway_is_not_cached():
+    cache = server.ResponseCache(ttl=60)
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return b"old"
+
+    pending = asyncio.ensure_future(cache.get_or_load("k", load))
+    await asyncio.sleep(0)
+    cache.invalidate("k")
+    assert (await pending).body == b"old"
+
+    async def reload():
+        return b"new"
+
+    assert (await cache.get_or_load("k", reload)).body == b"new"
+
+
+async def test_failed_load_reaches_every_waiter_and_is_not_cached():
+    cache = server.ResponseCache(ttl=60)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("storage down")
+
+    results = await asyncio.gather(*(cache.get_or_load("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.stats()["entries"] == 0
+
+
+async def test_cache_evicts_least_recently_used():
+    cache = server.ResponseCache(ttl=60, max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+
+    async def unused():
+        raise AssertionError("should be a hit")
+
+    await cache.get_or_load("a", unused)
+    cache.set("c", b"3")
+    assert cache.stats()["evictions"] == 1
+    assert (await cache.get_or_load("a", unused)).body == b"1"
@@ -0,0 +1,28 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("name", ["profile", "performance"])
+async def test_empty_update_leaves_caches_alone(client, name):
+    first = await client.get(f"/api/{name}")
+    before = await server.storage.versions.get_all()
+
+    response = await client.put(f"/api/{name}", json={})
+    assert response.status_code == 200
+    assert await server.storage.versions.get_all() == before
+    revalidated = await client.get(f"/api/{name}", headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+async def test_update_on_empty_storage_creates_the_document_once(client):
+    assert (await client.put("/api/profile", json={"name": "Renamed"})).json()["name"] == "Renamed"
+    assert (await server.storage.versions.get_all())["profile"] == 1
+    assert (await client.get("/api/profile")).json()["name"] == "Renamed"
+
+
+async def test_empty_update_on_empty_storage_returns_the_default(client):
+    assert (await client.put("/api/profile", json={})).json() == (await client.get("/api/profile")).json()
+    assert "profile" not in await server.storage.versions.get_all()
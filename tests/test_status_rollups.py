@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_status_summary_counts_per_client(client):
+    for name in ("web", "web", "worker"):
+        assert (await client.post("/api/status", json={"client_name": name})).status_code == 200
+
+    minute = (await client.get("/api/status/summary")).json()
+    assert minute["granularity"] == "minute"
+    assert minute["totals"] == {"web": 2, "worker": 1}
+
+    hour = (await client.get("/api/status/summary", params={"granularity": "hour", "client_name": "web"})).json()
+    assert hour["totals"] == {"web": 2}
+    assert [bucket["count"] for bucket in hour["buckets"]] == [2]
+    assert (await client.get("/api/status/summary", params={"granularity": "day"})).status_code == 422
+
+
+async def test_bucket_start_truncates_to_utc_boundaries():
+    moment = datetime(2026, 10, 18, 13, 47, 12, 5, tzinfo=timezone(timedelta(hours=2)))
+    assert server.bucket_start(moment, "minute") == datetime(2026, 10, 18, 11, 47, tzinfo=timezone.utc)
+    assert server.bucket_start(moment, "hour") == datetime(2026, 10, 18, 11, tzinfo=timezone.utc)
+    assert server.bucket_start(moment, "day") == datetime(2026, 10, 18, tzinfo=timezone.utc)
+    # 2026-10-18 is a Sunday; weeks start on Monday
+    assert server.bucket_start(moment, "week") == datetime(2026, 10, 12, tzinfo=timezone.utc)
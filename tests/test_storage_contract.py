@@ -0,0 +1,206 @@
+"""
+Behaviour both storage backends must share, run against MemoryStorage and, when MONGO_URL
+points at a real server, MongoStorage on a throwaway database:
+
+    MONGO_URL=mongodb://localhost:27017 python -m pytest tests/test_storage_contract.py
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from storage import MemoryStorage, MongoStorage, bucket_start
+from tests.conftest import MONGO_TEST_URL
+
+pytestmark = pytest.mark.anyio
+
+GOALS = ("forex-trading", "wealth-planning")
+
+
+@asynccontextmanager
+async def throwaway_database():
+    if not MONGO_TEST_URL:
+        pytest.skip("set MONGO_URL to run against MongoDB")
+    client = AsyncIOMotorClient(MONGO_TEST_URL, tz_aware=True, serverSelectionTimeoutMS=5000)
+    db = client[f"storage_contract_{uuid.uuid4().hex[:12]}"]
+    try:
+        yield db
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+@pytest.fixture
+async def mongo_db():
+    async with throwaway_database() as db:
+        yield db
+
+
+@pytest.fixture(params=["memory", "mongo"])
+async def storage(request):
+    if request.param == "memory":
+        storage = MemoryStorage(status_check_retention_seconds=3600)
+        await storage.prepare()
+        yield storage
+        return
+    async with throwaway_database() as db:
+        storage = MongoStorage(db, status_check_retention_seconds=3600)
+        await storage.prepare()
+        yield storage
+
+
+def insight(title, category, excerpt="", content=""):
+    return {
+        "id": str(uuid.uuid4()), "title": title, "excerpt": excerpt, "content": content,
+        "category": category, "date": "October 18, 2026", "readTime": "5 min read", "isPublished": True,
+    }
+
+
+async def test_insight_search_ranks_and_facets(storage):
+    docs = [
+        insight("Options income", "Options", content="Covered calls"),
+        insight("Currency hedging", "Forex", content="Forwards and options"),
+        insight("Rebalancing", "Strategy", content="Trim winners"),
+        {**insight("Options drafts", "Options"), "isPublished": False},
+    ]
+    assert await storage.insights.insert_many(docs) == {}
+    projection = {"_id": 0, "id": 1}
+
+    items, total, categories = await storage.insights.search("options", None, 10, 0, projection)
+    assert [item["id"] for item in items] == [docs[0]["id"], docs[1]["id"]]
+    assert total == 2
+    assert categories == [{"category": "Forex", "count": 1}, {"category": "Options", "count": 1}]
+
+    items, total, _ = await storage.insights.search("options", "Forex", 10, 0, projection)
+    assert ([item["id"] for item in items], total) == ([docs[1]["id"]], 1)
+
+
+async def test_insight_browse_is_newest_first(storage):
+    docs = [insight(f"Post {i}", "AB"[i % 2]) for i in range(5)]
+    await storage.insights.insert_many(docs)
+    projection = {"_id": 0, "id": 1}
+
+    assert await storage.insights.category_counts() == [{"category": "A", "count": 3}, {"category": "B", "count": 2}]
+    page = await storage.insights.browse(["A", "B"], 2, 1, projection)
+    assert [item["id"] for item in page] == [docs[3]["id"], docs[2]["id"]]
+    page = await storage.insights.browse(["B"], 10, 0, projection)
+    assert [item["id"] for item in page] == [docs[3]["id"], docs[1]["id"]]
+
+
+async def test_rollup_rebuild_replaces_counters(storage):
+    day = bucket_start(datetime.now(timezone.utc), "day")
+    contacts = [
+        {"id": str(uuid.uuid4()), "timestamp": day + timedelta(minutes=i), "investmentGoal": goal}
+        for i, goal in enumerate(["forex-trading", " Forex-Trading", "", None, "free text", "wealth-planning"])
+    ]
+    await storage.contacts.insert_many(contacts)
+    # A stale counter the rebuild must drop
+    await storage.contact_rollups.increment([({"granularity": "day", "bucket": day, "investmentGoal": "stale"}, 7, None)])
+
+    rebuilt = await storage.contact_rollups.rebuild(storage.contacts, "investmentGoal", ["day"], GOALS, "unspecified", "other")
+    assert rebuilt == 4
+    counters = await storage.contact_rollups.find("day", day, day + timedelta(days=1))
+    assert {counter["investmentGoal"]: counter["count"] for counter in counters} == {
+        "forex-trading": 2, "unspecified": 2, "other": 1, "wealth-planning": 1,
+    }
+
+    if isinstance(storage, MongoStorage):
+        # $out replaced the collection but kept its indexes
+        assert "granularity_bucket_goal_unique" in await storage.db.contact_rollups.index_information()
+
+
+def pending_contact(due):
+    return {
+        "id": str(uuid.uuid4()), "timestamp": due,
+        "notification": {"state": "pending", "attempts": 0, "nextAttemptAt": due},
+    }
+
+
+async def test_outbox_claims_are_leased(storage):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    contacts = [pending_contact(now - timedelta(seconds=3 - i)) for i in range(3)]
+    await storage.contacts.insert_many(contacts)
+    lease = now + timedelta(seconds=30)
+
+    first = await storage.contact_notifications.claim(now, lease, 2)
+    assert [doc["id"] for doc in first] == [contacts[0]["id"], contacts[1]["id"]]
+    assert all(doc["notification"]["attempts"] == 1 for doc in first)
+    # Leased documents are not due again until the lease runs out
+    second = await storage.contact_notifications.claim(now, lease, 10)
+    assert [doc["id"] for doc in second] == [contacts[2]["id"]]
+    assert await storage.contact_notifications.claim(now, lease, 10) == []
+    expired = await storage.contact_notifications.claim(lease, lease + timedelta(seconds=30), 10)
+    assert sorted(doc["id"] for doc in expired) == sorted(c["id"] for c in contacts)
+    assert all(doc["notification"]["attempts"] == 2 for doc in expired)
+
+    await storage.contact_notifications.complete(contacts[0]["id"], now)
+    await storage.contact_notifications.retry(contacts[1]["id"], now, "451 try again later")
+    await storage.contact_notifications.dead_letter(contacts[2]["id"], now, "550 rejected")
+    assert await storage.contact_notifications.counts() == {"sent": 1, "pending": 1, "dead": 1}
+    assert [doc["id"] for doc in await storage.contact_notifications.claim(now, lease, 10)] == [contacts[1]["id"]]
+
+    assert await storage.contact_notifications.requeue_dead(now) == 1
+    requeued = await storage.contact_notifications.claim(now, lease, 10)
+    assert [(doc["id"], doc["notification"]["attempts"]) for doc in requeued] == [(contacts[2]["id"], 1)]
+    # The outbox entry stays out of ordinary reads
+    assert all("notification" not in doc for doc in await storage.contacts.page(None, None, None, 10))
+
+
+async def test_concurrent_first_writes_create_one_singleton(storage):
+    default = {"name": "Default", "title": "Default"}
+    results = await asyncio.gather(
+        *(storage.profile.get_or_create(default) for _ in range(10)),
+        *(storage.profile.set_fields({"title": f"T{i}"}, default) for i in range(10)),
+    )
+    assert {result["name"] for result in results} == {"Default"}
+    assert (await storage.profile.get())["title"].startswith("T")
+    if isinstance(storage, MongoStorage):
+        assert await storage.db.profile.count_documents({}) == 1
+
+
+async def test_event_pages_follow_keyset_order(storage):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    docs = [{"id": f"{i:02d}", "timestamp": now - timedelta(seconds=i // 2), "client_name": "c"} for i in range(9)]
+    await storage.status_checks.insert_many(docs)
+    expected = [doc["id"] for doc in sorted(docs, key=lambda doc: (doc["timestamp"], doc["id"]), reverse=True)]
+
+    first = await storage.status_checks.page(None, None, None, 4)
+    last = first[-1]
+    rest = [doc async for doc in storage.status_checks.stream(None, None, (last["timestamp"], last["id"]), batch_size=2)]
+    assert [doc["id"] for doc in first + rest] == expected
+
+
+async def test_ttl_index_follows_configured_retention(mongo_db):
+    storage = MongoStorage(mongo_db, status_check_retention_seconds=3600)
+    await storage.prepare()
+
+    async def ttl():
+        index = (await mongo_db.status_checks.index_information()).get("timestamp_ttl")
+        return index and index["expireAfterSeconds"]
+
+    assert await ttl() == 3600
+    # An existing index is changed in place with collMod
+    await storage.ensure_ttl_index(mongo_db.status_checks, "timestamp", 7200)
+    assert await ttl() == 7200
+    await storage.ensure_ttl_index(mongo_db.status_checks, "timestamp", 0)
+    assert await ttl() is None
+
+
+async def test_duplicate_singletons_are_reported_not_deleted(mongo_db):
+    await mongo_db.profile.insert_many([{"name": "First"}, {"name": "Second"}])
+    storage = MongoStorage(mongo_db)
+    await storage.prepare()
+
+    assert await mongo_db.profile.count_documents({}) == 2
+    assert "singleton_unique" not in await mongo_db.profile.index_information()
+    duplicates = await storage.duplicate_singletons()
+    assert [doc["name"] for doc in duplicates["profile"]][0] == (await storage.profile.get())["name"]
+
+    await storage.remove_duplicate_singletons("profile", duplicates["profile"][1]["_id"])
+    await storage.ensure_indexes()
+    assert [doc["name"] async for doc in mongo_db.profile.find({})] == [duplicates["profile"][1]["name"]]
+    assert "singleton_unique" in await mongo_db.profile.index_information()
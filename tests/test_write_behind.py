@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_write_behind_retries_a_failed_flush(client, monkeypatch):
+    insert_many = server.storage.contacts.insert_many
+    failures = 2
+
+    async def flaky_insert_many(docs):
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise RuntimeError("not primary")
+        return await insert_many(docs)
+
+    monkeypatch.setattr(server.storage.contacts, "insert_many", flaky_insert_many)
+    queue = server.WriteBehindQueue("contacts", 100, 10, 0.01, max_retries=3, retry_backoff=0.001)
+    queue.start()
+    for _ in range(3):
+        await queue.put(server.Contact(name="Lead", email="lead@example.com").model_dump())
+    await queue.stop()
+
+    stats = queue.stats()
+    assert (stats["retries"], stats["flushedDocuments"], stats["droppedDocuments"]) == (2, 3, 0)
+    assert len((await client.get("/api/contacts")).json()["items"]) == 3
+
+
+async def test_write_behind_counts_dropped_documents(client, monkeypatch):
+    async def failing_insert_many(docs):
+        await asyncio.sleep(0)
+        raise RuntimeError("not primary")
+
+    monkeypatch.setattr(server.storage.contacts, "insert_many", failing_insert_many)
+    queue = server.WriteBehindQueue("contacts", 100, 10, 0.01, max_retries=1, retry_backoff=0.001)
+    queue.start()
+    for _ in range(4):
+        await queue.put(server.Contact(name="Lead", email="lead@example.com").model_dump())
+    await queue.stop()
+    assert queue.stats()["droppedDocuments"] == 4